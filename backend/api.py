@@ -0,0 +1,220 @@
+"""
+Read-only REST API over the analytics services, for tools that need the numbers without Dash.
+
+    uvicorn backend.api:app --host 0.0.0.0 --port 8060 --workers 2
+
+Handlers are async; the pandas work runs in a bounded thread pool (API_THREADS) so
+slow queries cannot pile up unbounded threads. Every response carries an ETag
+derived from the data version (the published dataset, or the mistake event store
+for mistake endpoints) and the query, and a matching If-None-Match gets
+304 without touching the data, so polling clients pay almost nothing between
+refreshes. Bodies are JSON records (orjson), or an Arrow IPC stream with ?format=arrow.
+"""
+import asyncio
+import contextvars
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Callable, Literal, Optional
+
+import orjson
+import pandas as pd
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import Response
+
+from backend.data_loader import cache_version, dataset_version, preload_datasets
+from backend.snapshots import pinned
+from backend.services import h1b_analytics, mistake_analytics
+from config.settings import API_THREADS, ensure_data_dirs
+
+_POOL = ThreadPoolExecutor(max_workers=API_THREADS, thread_name_prefix="api")
+
+Format = Literal["json", "arrow"]
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    ensure_data_dirs()
+    await asyncio.get_running_loop().run_in_executor(_POOL, preload_datasets)
+    yield
+    _POOL.shutdown(wait=False)
+
+
+app = FastAPI(title="F1 Job Dashboard API", lifespan=_lifespan)
+
+
+def _etag(request: Request, version: str) -> str:
+    """Strong ETag for this data version and query (path + sorted query parameters)."""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{query}".encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _json_default(value):
+    if value is pd.NaT:
+        return None
+    if hasattr(value, "isoformat"):  # pd.Timestamp
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _encode(df: pd.DataFrame, fmt: Format) -> tuple:
+    """(body bytes, media type) for a result frame."""
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes(), ARROW_MEDIA_TYPE
+    records = df.to_dict(orient="records")
+    return orjson.dumps(records, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY), "application/json"
+
+
+async def _respond(
+    request: Request,
+    compute: Callable[[], pd.DataFrame],
+    fmt: Format = "json",
+    version: Callable[[], str] = cache_version,
+) -> Response:
+    """
+    304 if the client's ETag is current, else run compute() in the pool and encode its frame.
+    The ETag and every dataset compute() loads come from one pinned snapshot.
+    """
+    with pinned():
+        etag = _etag(request, version())
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        # run_in_executor does not carry context variables (the pin) into the pool thread
+        context = contextvars.copy_context()
+        body, media_type = await asyncio.get_running_loop().run_in_executor(
+            _POOL, context.run, lambda: _encode(compute(), fmt)
+        )
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _ts(value: Optional[date]) -> Optional[pd.Timestamp]:
+    return pd.Timestamp(value) if value is not None else None
+
+
+def _end_ts(value: Optional[date]) -> Optional[pd.Timestamp]:
+    """Last instant of the end date, so end bounds are inclusive of the whole day."""
+    return pd.Timestamp(value) + pd.Timedelta(days=1) - pd.Timedelta(1, "ns") if value is not None else None
+
+
+@app.get("/api/version")
+async def version():
+    """Published dataset version; ETags change when it does."""
+    return Response(orjson.dumps({"dataset_version": dataset_version()}), media_type="application/json")
+
+
+@app.get("/api/states")
+async def state_metrics(
+    request: Request,
+    job_type: str = "All",
+    company_type: str = "All",
+    industry: str = "All",
+    format: Format = "json",
+):
+    """Per-state job count, H1B petitions and effectiveness score for one filter combination."""
+    return await _respond(
+        request, lambda: h1b_analytics.get_state_level_metrics(job_type, company_type, industry), format
+    )
+
+
+@app.get("/api/states/top")
+async def top_states(
+    request: Request,
+    by: Literal["jobs", "h1b"] = "jobs",
+    n: int = Query(10, ge=1, le=60),
+    format: Format = "json",
+):
+    """Top n states by job count or by H1B petitions."""
+    top = h1b_analytics.get_top_states_by_jobs if by == "jobs" else h1b_analytics.get_top_states_by_h1b
+    return await _respond(request, lambda: top(n), format)
+
+
+@app.get("/api/employers/top")
+async def top_employers(request: Request, n: int = Query(10, ge=1, le=500), format: Format = "json"):
+    """Top n H1B sponsors by petitions, with approval rate and median annual wage."""
+    return await _respond(request, lambda: h1b_analytics.get_top_employers(n), format)
+
+
+@app.get("/api/trends/daily")
+async def daily_trends(
+    request: Request,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    format: Format = "json",
+):
+    """Daily total job postings between start and end (inclusive dates)."""
+    return await _respond(
+        request, lambda: h1b_analytics.get_daily_job_trends(_ts(start), _end_ts(end)), format
+    )
+
+
+@app.get("/api/mistakes/by-type")
+async def mistakes_by_type(
+    request: Request,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    source: str = "All",
+    mistake_type: str = "All",
+    format: Format = "json",
+):
+    """Mistake counts by mistake type."""
+    return await _respond(
+        request,
+        lambda: mistake_analytics.get_mistakes_by_type_df(_ts(start), _ts(end), source, mistake_type),
+        format,
+        mistake_analytics.mistakes_version,
+    )
+
+
+@app.get("/api/mistakes/by-source")
+async def mistakes_by_source(
+    request: Request,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    source: str = "All",
+    mistake_type: str = "All",
+    format: Format = "json",
+):
+    """Mistake counts by application source."""
+    return await _respond(
+        request,
+        lambda: mistake_analytics.get_mistakes_by_source_df(_ts(start), _ts(end), source, mistake_type),
+        format,
+        mistake_analytics.mistakes_version,
+    )
+
+
+@app.get("/api/mistakes/time-series")
+async def mistakes_time_series(
+    request: Request,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    freq: Literal["D", "W", "MS"] = "W",
+    source: str = "All",
+    mistake_type: str = "All",
+    format: Format = "json",
+):
+    """Mistake counts per day, week or month."""
+    return await _respond(
+        request,
+        lambda: mistake_analytics.get_mistakes_time_series(_ts(start), _ts(end), freq, source, mistake_type),
+        format,
+        mistake_analytics.mistakes_version,
+    )
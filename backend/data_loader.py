@@ -1,17 +1,28 @@
 """
 Load processed data for dashboards. Falls back to synthetic data if files missing.
+Files are read from the currently published snapshot (see backend.snapshots).
+Job postings and mistakes history are date-partitioned (year=YYYY/month=MM);
+ranged loads only read the partitions and columns they need.
 """
+import itertools
+import re
+import time
 import pandas as pd
 import numpy as np
+from pyarrow import feather
 from pathlib import Path
 from datetime import datetime, timedelta
 from config.settings import (
     PROCESSED_DIR,
+    ARROW_SUFFIX,
     H1B_STATE_AGGREGATE,
+    H1B_EMPLOYER_AGGREGATE,
     JOB_POSTINGS_BY_STATE,
     JOB_POSTINGS_DAILY,
+    JOB_POSTINGS_BY_SEGMENT,
+    STATE_METRICS_CUBE,
     MISTAKES_AGGREGATE,
-    MISTAKES_BY_TYPE,
+    MISTAKES_DAILY_ROLLUP,
     USA_STATES,
     JOB_TYPES,
     COMPANY_TYPES,
@@ -19,6 +30,45 @@ from config.settings import (
     APPLICATION_SOURCES,
     MISTAKE_TYPES,
 )
+from backend.frame_cache import FRAME_CACHE
+from backend.metrics import timed
+from backend.snapshots import pinned, resolve, current_version
+
+
+# Low-cardinality string columns: written dictionary-encoded and kept categorical in memory,
+# so filters and groupbys work on integer codes
+MISTAKES_CATEGORICAL = ["company", "job_title", "source", "mistake_type", "intended_url", "actual_url"]
+SEGMENT_CATEGORICAL = ["state", "job_type", "company_type", "industry"]
+ROLLUP_CATEGORICAL = ["source", "mistake_type"]
+
+
+def categorize(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """Convert the given string columns (where present and not already categorical) to category dtype."""
+    convert = {
+        c: "category" for c in columns
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype)
+    }
+    return df.astype(convert) if convert else df
+
+
+def concat_frames(frames: list) -> pd.DataFrame:
+    """
+    pd.concat that keeps categorical columns categorical: frames whose categories
+    differ (e.g. partitions seeing different companies) are first recoded onto the union.
+    """
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    frames = list(frames)
+    frame_dtypes = [f.dtypes for f in frames]
+    for col in frames[0].columns:
+        dtypes = [d[col] for d in frame_dtypes if col in d.index]
+        if not all(isinstance(d, pd.CategoricalDtype) for d in dtypes) or all(d == dtypes[0] for d in dtypes):
+            continue
+        categories = pd.Index(dtypes[0].categories).append([d.categories for d in dtypes[1:]]).unique()
+        frames = [
+            f.assign(**{col: f[col].cat.set_categories(categories)}) if col in f.columns else f for f in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
 
 
 def _synthetic_h1b_by_state() -> pd.DataFrame:
@@ -26,7 +76,7 @@ def _synthetic_h1b_by_state() -> pd.DataFrame:
     np.random.seed(42)
     # Weight toward CA, TX, NY, WA, NJ
     weights = np.array([3, 0.5, 2, 0.8, 15, 2, 1.5, 0.3, 5, 2, 0.5, 0.5, 4, 1.5, 0.8, 0.6, 0.8, 0.5, 0.3, 1,
-                        2.5, 2, 1.5, 0.5, 1.2, 0.3, 0.6, 1, 0.4, 1.5, 0.5, 4, 2, 0.3, 2, 1, 0.8, 1.2, 1.5, 0.3, 0.8,
+                        2.5, 2, 1.5, 0.5, 1.2, 0.3, 0.6, 1, 0.4, 1.5, 0.5, 4, 2, 0.3, 2, 1, 0.8, 1.5, 0.3, 0.8,
                         0.2, 1, 8, 1, 0.2, 1, 1.5, 0.5, 1, 0.3, 1])
     n = len(USA_STATES)
     petitions = (np.random.rand(n) * 2000 + weights * 1500).astype(int)
@@ -37,6 +87,25 @@ def _synthetic_h1b_by_state() -> pd.DataFrame:
     })
 
 
+def _synthetic_h1b_by_employer() -> pd.DataFrame:
+    """Synthetic H1B petitions, approval rate and median wage per employer."""
+    rng = np.random.default_rng(47)
+    employers = ["TECH CORP", "HEALTH INC", "FINANCE CO", "STARTUP XYZ", "BIG RETAIL", "CLOUD SYSTEMS",
+                 "DATA ANALYTICS GROUP", "GLOBAL CONSULTING", "STATE UNIVERSITY", "BIOPHARMA LABS"]
+    petitions = np.sort(rng.integers(200, 6000, len(employers)))[::-1]
+    denials = (petitions * rng.uniform(0.01, 0.08, len(employers))).astype(int)
+    approvals = petitions - denials - (petitions * 0.02).astype(int)
+    return pd.DataFrame({
+        "employer": employers,
+        "petitions": petitions,
+        "approvals": approvals,
+        "denials": denials,
+        "approval_rate": (approvals / (approvals + denials)).round(4),
+        "median_wage": (rng.uniform(85, 165, len(employers)) * 1000).round(-3),
+        "fy": 2024,
+    })
+
+
 def _synthetic_job_postings_by_state() -> pd.DataFrame:
     """Synthetic daily job postings aggregated by state (for heat map)."""
     np.random.seed(43)
@@ -53,6 +122,47 @@ def _synthetic_job_postings_by_state() -> pd.DataFrame:
     })
 
 
+def _synthetic_job_postings_by_segment() -> pd.DataFrame:
+    """Synthetic postings by state x job type x company type x industry (sums to by-state counts)."""
+    by_state = _synthetic_job_postings_by_state()
+    np.random.seed(46)
+    segments = list(itertools.product(JOB_TYPES[1:], COMPANY_TYPES[1:], INDUSTRIES[1:]))
+    # Skew toward full-time, enterprise, technology roles
+    job_w = np.array([6, 1, 2, 1.5, 0.5])
+    company_w = np.array([2, 5, 1, 1, 0.5])
+    industry_w = np.array([5, 2, 2, 1, 1.5, 1])
+    share = np.einsum("i,j,k->ijk", job_w, company_w, industry_w).ravel()
+    rows = []
+    for state, total in zip(by_state["state"], by_state["job_count"]):
+        p = share * (0.5 + np.random.rand(len(share)))
+        counts = np.random.multinomial(total, p / p.sum())
+        rows.extend((state, jt, ct, ind, c) for (jt, ct, ind), c in zip(segments, counts))
+    return pd.DataFrame(rows, columns=["state", "job_type", "company_type", "industry", "job_count"])
+
+
+def _build_state_metrics_cube(h1b: pd.DataFrame, segments: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-state metrics for every job type x company type x industry combination,
+    including "All" rollups. Indexed (and sorted) by the three filter columns.
+    """
+    dims = ["job_type", "company_type", "industry"]
+    parts = []
+    for rolled in itertools.product([False, True], repeat=len(dims)):
+        keys = [d for d, r in zip(dims, rolled) if not r]
+        part = segments.groupby(keys + ["state"], as_index=False, observed=True)["job_count"].sum()
+        for d, r in zip(dims, rolled):
+            if r:
+                part[d] = "All"
+        parts.append(part)
+    cube = pd.concat(parts, ignore_index=True)
+    cube = cube.merge(h1b[["state", "petitions"]], on="state", how="left")
+    cube["petitions"] = cube["petitions"].fillna(0).astype(int)
+    # Composite score for "effectiveness" (job count + H1B weight)
+    cube["effectiveness_score"] = cube["job_count"] + cube["petitions"] * 2
+    cube = cube.sort_values(dims + ["state"]).set_index(dims)
+    return cube[["state", "job_count", "petitions", "effectiveness_score"]]
+
+
 def _synthetic_job_postings_daily() -> pd.DataFrame:
     """Time series of total job postings (last 90 days) for trend charts."""
     np.random.seed(44)
@@ -84,37 +194,264 @@ def _synthetic_mistakes() -> pd.DataFrame:
     })
 
 
+def _build_mistakes_daily_rollup(mistakes: pd.DataFrame) -> pd.DataFrame:
+    """Compact day x source x mistake_type count table, sorted by date."""
+    rollup = (
+        mistakes.assign(date=mistakes["date"].dt.normalize())
+        .groupby(["date", "source", "mistake_type"], as_index=False, observed=True)
+        .agg(count=("id", "count"))
+    )
+    return categorize(rollup.sort_values("date", kind="stable", ignore_index=True), ROLLUP_CATEGORICAL)
+
+
+def read_table(path: Path, columns: list = None) -> pd.DataFrame:
+    """
+    Read a processed parquet file, preferring its uncompressed Arrow IPC mirror
+    (same name, ARROW_SUFFIX) when the refresh wrote one. The mirror is memory-mapped:
+    numeric, date and string columns reference the OS page cache instead of being
+    decoded into this process's heap, so workers on a host share a single copy.
+    """
+    mirror = Path(path).with_suffix(ARROW_SUFFIX)
+    if mirror.is_file():
+        return feather.read_table(mirror, columns=columns, memory_map=True).to_pandas(split_blocks=True)
+    return pd.read_parquet(path, columns=columns)
+
+
+def _sorted_by_date(df: pd.DataFrame) -> pd.DataFrame:
+    """Sort a time-indexed table by date so ranges can be sliced with binary search."""
+    if df["date"].is_monotonic_increasing:
+        return df.reset_index(drop=True)
+    return df.sort_values("date", kind="stable", ignore_index=True)
+
+
+def slice_date_range(
+    df: pd.DataFrame,
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+) -> pd.DataFrame:
+    """
+    Rows with start_date <= date <= end_date from a frame sorted by date.
+    Uses searchsorted offsets, so the cost is O(log n) and the result is a slice, not a copy.
+    """
+    # Search the raw datetime64 values so bounds finer than the column's unit compare exactly
+    dates = df["date"].to_numpy()
+    lo = 0 if start_date is None else dates.searchsorted(pd.Timestamp(start_date).to_datetime64(), side="left")
+    hi = len(df) if end_date is None else dates.searchsorted(pd.Timestamp(end_date).to_datetime64(), side="right")
+    return df.iloc[lo:hi]
+
+
+@timed("loader")
 def load_h1b_by_state() -> pd.DataFrame:
     """Load H1B petition counts by state. Uses synthetic if no file."""
-    if H1B_STATE_AGGREGATE.exists():
-        return pd.read_parquet(H1B_STATE_AGGREGATE)
-    return _synthetic_h1b_by_state()
+    return FRAME_CACHE.get(
+        "h1b_by_state", resolve(H1B_STATE_AGGREGATE), read_table, _synthetic_h1b_by_state
+    )
+
 
+@timed("loader")
+def load_h1b_by_employer() -> pd.DataFrame:
+    """Load H1B petitions, approval rate and median wage per employer. Uses synthetic if no file."""
+    return FRAME_CACHE.get(
+        "h1b_by_employer", resolve(H1B_EMPLOYER_AGGREGATE), read_table, _synthetic_h1b_by_employer
+    )
 
+
+@timed("loader")
 def load_job_postings_by_state() -> pd.DataFrame:
     """Load job postings by state (for heat map)."""
-    if JOB_POSTINGS_BY_STATE.exists():
-        return pd.read_parquet(JOB_POSTINGS_BY_STATE)
-    return _synthetic_job_postings_by_state()
+    return FRAME_CACHE.get(
+        "job_postings_by_state", resolve(JOB_POSTINGS_BY_STATE), read_table, _synthetic_job_postings_by_state
+    )
+
+
+@timed("loader")
+def load_job_postings_by_segment() -> pd.DataFrame:
+    """Load job postings by state and job type / company type / industry."""
+    return FRAME_CACHE.get(
+        "job_postings_by_segment",
+        resolve(JOB_POSTINGS_BY_SEGMENT),
+        lambda path: categorize(read_table(path), SEGMENT_CATEGORICAL),
+        lambda: categorize(_synthetic_job_postings_by_segment(), SEGMENT_CATEGORICAL),
+    )
 
 
-def load_job_postings_daily() -> pd.DataFrame:
-    """Load daily job postings time series."""
-    if JOB_POSTINGS_DAILY.exists():
-        return pd.read_parquet(JOB_POSTINGS_DAILY)
-    return _synthetic_job_postings_daily()
+@timed("loader")
+def load_state_metrics_cube() -> pd.DataFrame:
+    """Load the precomputed state-metrics cube; built in-process if the refresh has not written it."""
+    return FRAME_CACHE.get(
+        "state_metrics_cube",
+        resolve(STATE_METRICS_CUBE),
+        read_table,
+        lambda: _build_state_metrics_cube(load_h1b_by_state(), load_job_postings_by_segment()),
+    )
 
 
-def load_mistakes() -> pd.DataFrame:
-    """Load job application mistakes log."""
-    if MISTAKES_AGGREGATE.exists():
-        return pd.read_parquet(MISTAKES_AGGREGATE)
-    return _synthetic_mistakes()
+_PARTITION_RE = re.compile(r"^year=(\d{4})/month=(\d{2})$")
 
 
+def partition_dir(dataset: Path, ts: pd.Timestamp) -> Path:
+    """Partition directory holding rows dated ts."""
+    return dataset / f"year={ts.year}" / f"month={ts.month:02d}"
+
+
+def _partitions(dataset: Path, start_date=None, end_date=None) -> list:
+    """Partition directories of dataset overlapping [start_date, end_date], oldest first."""
+    start = pd.Timestamp(start_date).to_period("M") if start_date is not None else None
+    end = pd.Timestamp(end_date).to_period("M") if end_date is not None else None
+    found = []
+    for d in dataset.glob("year=*/month=*"):
+        m = _PARTITION_RE.match(d.relative_to(dataset).as_posix())
+        if not m or not d.is_dir():
+            continue
+        period = pd.Period(year=int(m.group(1)), month=int(m.group(2)), freq="M")
+        if (start is None or period >= start) and (end is None or period <= end):
+            found.append((period, d))
+    return [d for _, d in sorted(found)]
+
+
+def _read_partition(part: Path, columns=None, categorical=()) -> pd.DataFrame:
+    files = sorted(part.glob("*.parquet"))
+    frames = [categorize(read_table(f, columns=columns), categorical) for f in files]
+    return _sorted_by_date(concat_frames(frames)) if frames else pd.DataFrame(columns=columns)
+
+
+def _load_dated(
+    name: str,
+    path: Path,
+    fallback,
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    columns: list = None,
+    categorical: tuple = (),
+) -> pd.DataFrame:
+    """
+    Rows of a dated dataset in [start_date, end_date], sorted by date, limited to columns.
+    Partitioned datasets are pruned to the overlapping months and each (partition,
+    column set) is cached separately; a single file or synthetic fallback is cached whole.
+    The categorical columns are held as category dtype (also for legacy object-typed files).
+    """
+    cols = None if columns is None else list(dict.fromkeys(["date", *columns]))
+    if not path.is_dir():
+        df = FRAME_CACHE.get(
+            name,
+            path,
+            lambda p: _sorted_by_date(categorize(read_table(p), categorical)),
+            lambda: _sorted_by_date(categorize(fallback(), categorical)),
+        )
+        df = slice_date_range(df, start_date, end_date)
+        return df if cols is None else df[cols]
+    cols_key = "*" if cols is None else ",".join(cols)
+
+    def cached(part: Path) -> pd.DataFrame:
+        return FRAME_CACHE.get(
+            f"{name}/{part.relative_to(path).as_posix()}[{cols_key}]",
+            part,
+            lambda d: _read_partition(d, cols, categorical),
+            lambda: pd.DataFrame(columns=cols),
+        )
+
+    frames = [f for f in (cached(p) for p in _partitions(path, start_date, end_date)) if len(f)]
+    if not frames:
+        # Nothing in range: return an empty frame with the dataset's schema
+        newest = _partitions(path)[-1:]
+        return cached(newest[0]).head(0) if newest else pd.DataFrame(columns=cols or ["date"])
+    df = frames[0] if len(frames) == 1 else concat_frames(frames)
+    return slice_date_range(df, start_date, end_date)
+
+
+@timed("loader")
+def load_job_postings_daily(
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    columns: list = None,
+) -> pd.DataFrame:
+    """Load daily job postings time series (optionally a date range / column subset), sorted by date."""
+    return _load_dated(
+        "job_postings_daily",
+        resolve(JOB_POSTINGS_DAILY),
+        _synthetic_job_postings_daily,
+        start_date,
+        end_date,
+        columns,
+    )
+
+
+@timed("loader")
+def load_mistakes(
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    columns: list = None,
+) -> pd.DataFrame:
+    """Load job application mistakes log (optionally a date range / column subset), sorted by date."""
+    return _load_dated(
+        "mistakes",
+        resolve(MISTAKES_AGGREGATE),
+        _synthetic_mistakes,
+        start_date,
+        end_date,
+        columns,
+        categorical=MISTAKES_CATEGORICAL,
+    )
+
+
+@timed("loader")
+def load_mistakes_daily_rollup() -> pd.DataFrame:
+    """Daily mistake counts by source and type; all mistake aggregates are derived from this."""
+    return FRAME_CACHE.get(
+        "mistakes_daily_rollup",
+        resolve(MISTAKES_DAILY_ROLLUP),
+        lambda path: _sorted_by_date(categorize(read_table(path), ROLLUP_CATEGORICAL)),
+        lambda: _build_mistakes_daily_rollup(load_mistakes()),
+    )
+
+
+@timed("loader")
 def load_mistakes_by_type() -> pd.DataFrame:
     """Aggregated mistake counts by type (for bar/pie charts)."""
-    mistakes = load_mistakes()
-    return mistakes.groupby("mistake_type", as_index=False).agg(
-        count=("id", "count")
-    ).sort_values("count", ascending=False)
+    rollup = load_mistakes_daily_rollup()
+    return rollup.groupby("mistake_type", as_index=False, observed=True)["count"].sum().sort_values(
+        "count", ascending=False
+    )
+
+
+_PRELOAD = {"loaded": False, "version": None, "seconds": None}
+
+
+def preload_datasets() -> dict:
+    """
+    Load every dataset into the shared cache. Called before forking WSGI workers
+    so they share the loaded pages copy-on-write instead of each reading from disk.
+    """
+    t0 = time.perf_counter()
+    with pinned() as version:
+        load_h1b_by_state()
+        load_h1b_by_employer()
+        load_job_postings_by_state()
+        load_job_postings_by_segment()
+        load_state_metrics_cube()
+        load_job_postings_daily()
+        load_mistakes()
+        load_mistakes_daily_rollup()
+    _PRELOAD.update(loaded=True, version=version or "legacy", seconds=time.perf_counter() - t0)
+    return preload_status()
+
+
+def preload_status() -> dict:
+    """Whether preload_datasets() has completed, for which dataset version, and how long it took."""
+    return dict(_PRELOAD)
+
+
+def dataset_version() -> str:
+    """Version of the published snapshot the loaders read from ("legacy" for the flat layout)."""
+    return current_version() or "legacy"
+
+
+def cache_version() -> str:
+    """dataset_version() for keying derived caches (figures, API ETags); legacy synthetic data changes daily."""
+    version = dataset_version()
+    return f"{version}-{datetime.now().date().isoformat()}" if version == "legacy" else version
+
+
+def cache_stats() -> dict:
+    """Hit/miss/reload counters of the shared loader cache."""
+    return FRAME_CACHE.stats()
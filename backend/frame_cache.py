@@ -0,0 +1,102 @@
+"""
+Process-wide, refresh-aware cache for DataFrames loaded by backend.data_loader.
+
+Entries are keyed by dataset name and validated against the source file's
+(path, mtime_ns, size) signature on every lookup, so files swapped or newly
+published by jobs/daily_refresh.py are picked up on the next call without a restart.
+Cached frames are read-only; callers get a shallow copy they may add columns to.
+Writes into a copy never reach the cache because copy-on-write (always on in
+pandas 3, which requirements.txt pins) copies the shared block first.
+"""
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+Signature = Optional[Tuple[str, int, int]]
+
+
+def _file_signature(path: Optional[Path]) -> Signature:
+    """(path, mtime_ns, size) of path, or None if it does not exist."""
+    if path is None:
+        return None
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mark the frame's numpy block buffers read-only so in-place writes fail loudly.
+    The consolidated blocks themselves are flagged (column views derived later inherit it);
+    flagging only per-column views would leave the block writable.
+    """
+    for block in df._mgr.blocks:
+        # Extension blocks (categorical, Arrow-backed strings) hold no numpy buffer to flag
+        if isinstance(block.values, np.ndarray):
+            block.values.flags.writeable = False
+    return df
+
+
+class FrameCache:
+    """Thread-safe cache of frames keyed by name, invalidated on file change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Signature, pd.DataFrame]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+
+    def get(
+        self,
+        name: str,
+        path: Optional[Path],
+        read: Callable[[Path], pd.DataFrame],
+        fallback: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        Return the cached frame for name, (re)loading it when path changed.
+        read(path) is used when the file exists, fallback() otherwise.
+        """
+        sig = _file_signature(path)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == sig:
+                self._hits += 1
+                return entry[1].copy(deep=False)
+        df = read(path) if sig is not None else fallback()
+        df = _freeze(df)
+        with self._lock:
+            if name in self._entries:
+                self._reloads += 1
+            else:
+                self._misses += 1
+            self._entries[name] = (sig, df)
+        return df.copy(deep=False)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop one entry (or all entries when name is None)."""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/reload counters and number of cached frames."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "reloads": self._reloads,
+                "entries": len(self._entries),
+            }
+
+
+# Shared by all loaders in this process
+FRAME_CACHE = FrameCache()
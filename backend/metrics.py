@@ -0,0 +1,198 @@
+"""
+Opt-in, in-process latency/size histograms for services, loaders and Dash callbacks.
+
+Enabled with METRICS_ENABLED=1 (see config.settings). When disabled, timed()
+returns the function unchanged and stage() is a shared no-op context manager,
+so instrumented code pays nothing beyond one attribute lookup.
+
+Each process keeps its own registry (per Gunicorn worker); render_prometheus()
+emits it in Prometheus text format. Durations recorded while a request scope is
+open (see dashboards.instrumentation) are also collected for a Server-Timing header.
+"""
+import bisect
+import contextvars
+import functools
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.settings import METRICS_ENABLED
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+BYTE_BUCKETS = (1_024, 10_240, 102_400, 524_288, 1_048_576, 5_242_880, 10_485_760, 52_428_800)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """Cumulative-bucket histogram series of one metric, keyed by label values."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.series: Dict[Labels, List] = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, labels: Labels) -> None:
+        s = self.series.get(labels)
+        if s is None:
+            s = self.series[labels] = [0] * (len(self.buckets) + 2)
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            s[i] += 1
+        s[-2] += value
+        s[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, s in sorted(self.series.items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            sep = "," if base else ""
+            running = 0
+            for le, n in zip(self.buckets, s):
+                running += n
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{le:g}"}} {running}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {s[-1]}')
+            lines.append(f"{self.name}_sum{{{base}}} {s[-2]:.6g}")
+            lines.append(f"{self.name}_count{{{base}}} {s[-1]}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_lock = threading.Lock()
+_HISTOGRAMS: Dict[str, _Histogram] = {}
+
+
+def _histogram(name: str, help_text: str, buckets: Tuple[float, ...]) -> _Histogram:
+    h = _HISTOGRAMS.get(name)
+    if h is None:
+        h = _HISTOGRAMS[name] = _Histogram(name, help_text, buckets)
+    return h
+
+
+def observe(name: str, value: float, help_text: str = "", buckets=DURATION_BUCKETS, **labels: str) -> None:
+    """Record value in histogram name (created on first use) under the given labels."""
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        _histogram(name, help_text or name, buckets).observe(value, key)
+
+
+def render_prometheus() -> str:
+    """All histograms in Prometheus text exposition format."""
+    with _lock:
+        lines = [line for name in sorted(_HISTOGRAMS) for line in _HISTOGRAMS[name].render()]
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    with _lock:
+        _HISTOGRAMS.clear()
+
+
+# Request scope: which callback is running and the timings to report in Server-Timing
+
+class RequestScope:
+    def __init__(self):
+        self.callback = "unknown"
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. 'callback;dur=12.5, service.get_state_level_metrics;dur=1.1'."""
+        return ", ".join(f"{_TOKEN_RE.sub('_', n)};dur={s * 1000:.2f}" for n, s in self.timings.items())
+
+
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9_.\-]")
+_scope: contextvars.ContextVar[Optional[RequestScope]] = contextvars.ContextVar("metrics_scope", default=None)
+
+
+def open_scope() -> contextvars.Token:
+    return _scope.set(RequestScope())
+
+
+def close_scope(token: contextvars.Token) -> None:
+    _scope.reset(token)
+
+
+def current_scope() -> Optional[RequestScope]:
+    return _scope.get()
+
+
+def _row_count(result) -> Optional[int]:
+    """Rows of a DataFrame result (or of all frames in a dict result); None for other values."""
+    if hasattr(result, "shape"):
+        return int(result.shape[0])
+    if isinstance(result, dict):
+        counts = [int(v.shape[0]) for v in result.values() if hasattr(v, "shape")]
+        return sum(counts) if counts else None
+    return None
+
+
+def timed(kind: str) -> Callable:
+    """
+    Decorator: record the call's duration and returned row count, labelled
+    kind (e.g. "service", "loader") and the function name. Identity when disabled.
+    """
+    def decorator(fn: Callable) -> Callable:
+        if not METRICS_ENABLED:
+            return fn
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            result = fn(*args, **kwargs)
+            elapsed = time.perf_counter() - t0
+            observe("backend_call_duration_seconds", elapsed, "Service/loader call latency",
+                    kind=kind, function=name)
+            rows = _row_count(result)
+            if rows is not None:
+                observe("backend_call_rows", rows, "Rows returned by service/loader calls", ROW_BUCKETS,
+                        kind=kind, function=name)
+            scope = _scope.get()
+            if scope is not None:
+                scope.add(f"{kind}.{name}", elapsed)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class _NoStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+@contextmanager
+def _stage(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        scope = _scope.get()
+        observe("dash_callback_stage_duration_seconds", elapsed, "Duration of stages inside Dash callbacks",
+                callback=scope.callback if scope else "", stage=name)
+        if scope is not None:
+            scope.add(name, elapsed)
+
+
+def stage(name: str):
+    """Context manager timing one stage of a callback (e.g. "figure", "serialize"). No-op when disabled."""
+    return _stage(name) if METRICS_ENABLED else _NO_STAGE
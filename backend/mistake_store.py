@@ -0,0 +1,263 @@
+"""
+SQLite event store for user-submitted job application mistakes.
+
+The database runs in WAL mode, so one writer and many readers (Dash workers, the
+API) proceed concurrently. ingest_events() appends each call's events in one
+transaction, after checking source and mistake_type against the settings
+vocabularies, so bad input never leaves a half-ingested store. Queries push
+date/source/type filters and group-bys into SQL against the (date),
+(source, date) and (mistake_type, date) indexes, so reads never load the full
+history into pandas.
+
+Dates are stored as INTEGER microseconds since the epoch (naive, like the parquet
+log), which keeps range filters and day bucketing to integer arithmetic.
+"""
+import itertools
+import os
+import sqlite3
+import threading
+import warnings
+from pathlib import Path
+from typing import Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+import pandas as pd
+
+from config.settings import MISTAKES_DB, MISTAKES_INGEST_BATCH, APPLICATION_SOURCES, MISTAKE_TYPES
+
+COLUMNS = ["date", "company", "job_title", "source", "mistake_type", "intended_url", "actual_url"]
+GROUP_COLUMNS = ("source", "mistake_type")
+_US_PER_DAY = 86_400_000_000
+# Accepted values per required column ("All" is a filter, not a source)
+_VOCABULARIES = {
+    "source": {s for s in APPLICATION_SOURCES if s != "All"},
+    "mistake_type": set(MISTAKE_TYPES),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mistakes (
+    id INTEGER PRIMARY KEY,
+    date INTEGER NOT NULL,
+    company TEXT,
+    job_title TEXT,
+    source TEXT NOT NULL,
+    mistake_type TEXT NOT NULL,
+    intended_url TEXT,
+    actual_url TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mistakes_date ON mistakes (date);
+CREATE INDEX IF NOT EXISTS idx_mistakes_source_date ON mistakes (source, date);
+CREATE INDEX IF NOT EXISTS idx_mistakes_type_date ON mistakes (mistake_type, date);
+"""
+
+_local = threading.local()
+
+
+def connect(path: Optional[Path] = None) -> sqlite3.Connection:
+    """This thread's connection to the store at path (default MISTAKES_DB), created with the schema on first use."""
+    path = Path(path or MISTAKES_DB)
+    # Keyed by pid too: connections must not be shared with forked workers
+    key = (os.getpid(), str(path))
+    conns = _local.__dict__.setdefault("conns", {})
+    conn = conns.get(key)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Durable at checkpoints; a crash can lose only the last transactions, never corrupt
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # KiB; keeps the hot index pages cached during bulk loads
+        conn.execute("PRAGMA analysis_limit=1000")  # ANALYZE samples; milliseconds even on large stores
+        conn.executescript(_SCHEMA)
+        conns[key] = conn
+    return conn
+
+
+def close(path: Optional[Path] = None) -> None:
+    """Close this thread's connection to path."""
+    key = (os.getpid(), str(Path(path or MISTAKES_DB)))
+    conn = _local.__dict__.get("conns", {}).pop(key, None)
+    if conn is not None:
+        conn.close()
+
+
+def _to_us(values, errors: str = "raise") -> pd.Series:
+    """
+    Microseconds since the epoch (Int64, NA where unparseable with errors="coerce");
+    timezone-aware values are converted to naive UTC first.
+    """
+    dates = pd.to_datetime(pd.Series(values), utc=True, errors=errors).dt.tz_localize(None)
+    us = dates.astype("datetime64[us]")
+    return pd.Series(us.to_numpy().view("int64"), index=us.index, dtype="Int64").mask(us.isna())
+
+
+def _validate(df: pd.DataFrame) -> None:
+    """Raise ValueError if date is missing, or source or mistake_type is missing or outside the settings vocabularies."""
+    if "date" not in df.columns:
+        raise ValueError("Mistake events need a 'date' column")
+    for column, allowed in _VOCABULARIES.items():
+        if column not in df.columns:
+            raise ValueError(f"Mistake events need a {column!r} column")
+        unknown = set(df[column].astype(object).where(df[column].notna(), None).unique()) - allowed
+        if unknown:
+            raise ValueError(f"Unknown {column} values {sorted(map(str, unknown))}; expected one of {sorted(allowed)}")
+
+
+def _rows(df: pd.DataFrame) -> Tuple[List[Tuple], int]:
+    """
+    (insert tuples in COLUMNS order, rows dropped for a missing or unparseable date).
+    Tuples are sorted by date so index inserts stay local; missing columns and NA values become NULL.
+    """
+    dates = _to_us(df["date"], errors="coerce")
+    valid = dates.notna().to_numpy()
+    dates = dates.to_numpy(dtype="int64", na_value=0)[valid]
+    order = dates.argsort(kind="stable")
+    cols = {"date": dates[order].tolist()}
+    for c in COLUMNS[1:]:
+        if c in df.columns:
+            s = df[c].astype(object)
+            cols[c] = s.where(s.notna(), None).to_numpy()[valid][order].tolist()
+        else:
+            cols[c] = [None] * len(dates)
+    return list(zip(*(cols[c] for c in COLUMNS))), int((~valid).sum())
+
+
+def _batches(
+    events: Union[pd.DataFrame, Iterable[pd.DataFrame], Iterable[Mapping]],
+    batch_size: int,
+) -> Iterator[pd.DataFrame]:
+    if isinstance(events, pd.DataFrame):
+        events = [events]
+    it = iter(events)
+    first = next(it, None)
+    if first is None:
+        return
+    it = itertools.chain([first], it)
+    if isinstance(first, pd.DataFrame):
+        for df in it:
+            for i in range(0, len(df), batch_size):
+                yield df.iloc[i:i + batch_size]
+    else:
+        for batch in iter(lambda: list(itertools.islice(it, batch_size)), []):
+            yield pd.DataFrame(batch)
+
+
+def ingest_events(
+    events: Union[pd.DataFrame, Iterable[pd.DataFrame], Iterable[Mapping]],
+    path: Optional[Path] = None,
+    batch_size: int = MISTAKES_INGEST_BATCH,
+) -> int:
+    """
+    Append mistake events (a DataFrame, an iterable of DataFrames, or dicts with COLUMNS
+    keys) batch_size rows at a time; return the number inserted. date accepts anything
+    pd.to_datetime does; rows with a missing or unparseable date are dropped, with a
+    warning giving the count. source and mistake_type must come from APPLICATION_SOURCES
+    and MISTAKE_TYPES. All batches go into one transaction, so invalid input raises
+    ValueError and leaves the store unchanged.
+    """
+    conn = connect(path)
+    sql = f"INSERT INTO mistakes ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+    inserted = dropped = 0
+    try:
+        for chunk in _batches(events, batch_size):
+            _validate(chunk)
+            rows, skipped = _rows(chunk)
+            conn.executemany(sql, rows)
+            inserted += len(rows)
+            dropped += skipped
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    if dropped:
+        warnings.warn(f"Dropped {dropped:,} mistake events with a missing or unparseable date", stacklevel=2)
+    if inserted:
+        # Fresh statistics let the planner skip-scan the (source|mistake_type, date) indexes for group-bys
+        conn.execute("ANALYZE")
+    return inserted
+
+
+def _where(
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    source: str = "All",
+    mistake_type: str = "All",
+) -> Tuple[str, List]:
+    clauses, params = [], []
+    if source and source != "All":
+        clauses.append("source = ?")
+        params.append(source)
+    if mistake_type and mistake_type != "All":
+        clauses.append("mistake_type = ?")
+        params.append(mistake_type)
+    if start_date is not None and pd.notna(start_date):
+        clauses.append("date >= ?")
+        params.append(int(_to_us([start_date]).iloc[0]))
+    if end_date is not None and pd.notna(end_date):
+        clauses.append("date <= ?")
+        params.append(int(_to_us([end_date]).iloc[0]))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def count_by(
+    column: str,
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    source: str = "All",
+    mistake_type: str = "All",
+    path: Optional[Path] = None,
+) -> pd.DataFrame:
+    """[column, count] for source or mistake_type, most frequent first."""
+    if column not in GROUP_COLUMNS:
+        raise ValueError(f"Cannot group by {column!r}; expected one of {GROUP_COLUMNS}")
+    where, params = _where(start_date, end_date, source, mistake_type)
+    rows = connect(path).execute(
+        f"SELECT {column}, COUNT(*) AS n FROM mistakes{where} GROUP BY {column} ORDER BY n DESC", params
+    ).fetchall()
+    return pd.DataFrame(rows, columns=[column, "count"])
+
+
+def daily_counts(
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    source: str = "All",
+    mistake_type: str = "All",
+    path: Optional[Path] = None,
+) -> pd.DataFrame:
+    """[date, count] per calendar day with at least one event, oldest first."""
+    where, params = _where(start_date, end_date, source, mistake_type)
+    rows = connect(path).execute(
+        f"SELECT date / {_US_PER_DAY} AS day, COUNT(*) FROM mistakes{where} GROUP BY day ORDER BY day", params
+    ).fetchall()
+    df = pd.DataFrame(rows, columns=["day", "count"])
+    return pd.DataFrame({"date": pd.to_datetime(df["day"] * _US_PER_DAY, unit="us"), "count": df["count"]})
+
+
+def query_events(
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    source: str = "All",
+    mistake_type: str = "All",
+    columns: List[str] = None,
+    limit: Optional[int] = None,
+    newest_first: bool = False,
+    path: Optional[Path] = None,
+) -> pd.DataFrame:
+    """Matching events (id plus columns, default all), ordered by date."""
+    columns = [c for c in (columns or COLUMNS) if c in COLUMNS]
+    select = ["id"] + [c for c in columns if c != "id"]
+    where, params = _where(start_date, end_date, source, mistake_type)
+    sql = f"SELECT {', '.join(select)} FROM mistakes{where} ORDER BY date {'DESC' if newest_first else 'ASC'}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    df = pd.DataFrame(connect(path).execute(sql, params).fetchall(), columns=select)
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], unit="us")
+    return df
+
+
+def store_version(path: Optional[Path] = None) -> str:
+    """Changes with every ingest (events are append-only, so the highest id identifies the contents)."""
+    (max_id,) = connect(path).execute("SELECT COALESCE(MAX(id), 0) FROM mistakes").fetchone()
+    return f"events-{max_id}"
@@ -3,40 +3,47 @@ H1B data analytics: state-level aggregations, time trends, top employers.
 """
 import pandas as pd
 import numpy as np
-from backend.data_loader import load_h1b_by_state, load_job_postings_daily, load_job_postings_by_state
+from backend.data_loader import load_h1b_by_employer, load_job_postings_daily, load_state_metrics_cube
+from backend.metrics import timed
 
 
+@timed("service")
 def get_state_level_metrics(
     job_type: str = "All",
     company_type: str = "All",
     industry: str = "All",
 ) -> pd.DataFrame:
     """
-    Merge H1B and job postings by state for heat map and tables.
-    Filters are applied to job_postings; H1B is quarterly so we keep full set.
+    Per-state job count, H1B petitions and effectiveness score for heat map and tables.
+    Served from the precomputed cube (see jobs/daily_refresh.py), so any filter
+    combination is a keyed lookup. H1B is quarterly so it is not filtered.
     """
-    h1b = load_h1b_by_state()
-    jobs = load_job_postings_by_state()
-    merged = jobs.merge(h1b[["state", "petitions"]], on="state", how="left")
-    merged["petitions"] = merged["petitions"].fillna(0).astype(int)
-    # Composite score for "effectiveness" (job count + H1B weight)
-    merged["effectiveness_score"] = merged["job_count"] + merged["petitions"] * 2
-    return merged
+    cube = load_state_metrics_cube()
+    key = (job_type or "All", company_type or "All", industry or "All")
+    try:
+        # Positional rows keep a DataFrame even when the combination has a single state row
+        # (cube.loc[key] would return a Series); as fast as loc on the sorted index
+        return cube.iloc[cube.index.get_locs(key)].reset_index(drop=True)
+    except KeyError:
+        return pd.DataFrame(columns=["state", "job_count", "petitions", "effectiveness_score"])
 
 
+@timed("service")
+def get_state_metrics_cube() -> pd.DataFrame:
+    """Every filter combination of get_state_level_metrics in one frame, indexed by (job_type, company_type, industry)."""
+    return load_state_metrics_cube()
+
+
+@timed("service")
 def get_daily_job_trends(
     start_date: pd.Timestamp = None,
     end_date: pd.Timestamp = None,
 ) -> pd.DataFrame:
     """Time series of daily job postings for trend chart."""
-    df = load_job_postings_daily()
-    if start_date is not None:
-        df = df[df["date"] >= start_date]
-    if end_date is not None:
-        df = df[df["date"] <= end_date]
-    return df.sort_values("date")
+    return load_job_postings_daily(start_date, end_date, columns=["total_postings"])
 
 
+@timed("service")
 def get_state_detail(state_abbr: str) -> pd.DataFrame:
     """Single-state view for detail page: one row with state metrics."""
     metrics = get_state_level_metrics()
@@ -46,13 +53,22 @@ def get_state_detail(state_abbr: str) -> pd.DataFrame:
     return row
 
 
+@timed("service")
 def get_top_states_by_jobs(n: int = 10) -> pd.DataFrame:
     """Top N states by job count (for tables)."""
     metrics = get_state_level_metrics()
     return metrics.nlargest(n, "job_count")[["state", "job_count", "petitions", "effectiveness_score"]]
 
 
+@timed("service")
 def get_top_states_by_h1b(n: int = 10) -> pd.DataFrame:
     """Top N states by H1B petitions."""
     metrics = get_state_level_metrics()
     return metrics.nlargest(n, "petitions")[["state", "petitions", "job_count", "effectiveness_score"]]
+
+
+@timed("service")
+def get_top_employers(n: int = 10) -> pd.DataFrame:
+    """Top N H1B sponsors by petitions, with approval rate and median annual wage."""
+    employers = load_h1b_by_employer()
+    return employers.nlargest(n, "petitions")[["employer", "petitions", "approval_rate", "median_wage", "fy"]]
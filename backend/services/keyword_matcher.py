@@ -0,0 +1,82 @@
+"""
+Multi-pattern keyword matching for resume analysis.
+
+All keywords are compiled into one trie-shaped regex, so a single pass over the
+text finds every (case-insensitive, substring) occurrence of every keyword,
+with positions. Matches are overlapping: "Java" is reported inside "JavaScript".
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching the longest of words at a position, factored as a prefix trie."""
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        alt = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional: try the longer keyword first, fall back to the one ending here
+        return f"(?:{alt})?" if "" in node else alt
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Compiled matcher over a fixed keyword list; build once, reuse per request."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(sorted({k.lower() for k in keywords if k}))
+        # A longest match at a position also implies every keyword that is a prefix of it
+        known = set(self.keywords)
+        self._prefixes: Dict[str, List[str]] = {
+            k: [k[:i] for i in range(1, len(k)) if k[:i] in known] for k in self.keywords
+        }
+        pattern = _trie_pattern(self.keywords) if self.keywords else r"(?!)"
+        self._regex = re.compile(f"(?=({pattern}))")
+
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """Map of lowercased keyword -> start offsets of every occurrence in text."""
+        hits: Dict[str, List[int]] = {}
+        for m in self._regex.finditer((text or "").lower()):
+            word = m.group(1)
+            if not word:
+                continue
+            start = m.start(1)
+            hits.setdefault(word, []).append(start)
+            for p in self._prefixes[word]:
+                hits.setdefault(p, []).append(start)
+        return hits
+
+    def count_all(self, text: str) -> Dict[str, int]:
+        """Map of lowercased keyword -> number of occurrences in text."""
+        longest = Counter(m.group(1) for m in self._regex.finditer((text or "").lower()))
+        counts: Dict[str, int] = {}
+        for word, n in longest.items():
+            if not word:
+                continue
+            counts[word] = counts.get(word, 0) + n
+            for p in self._prefixes[word]:
+                counts[p] = counts.get(p, 0) + n
+        return counts
+
+    def extend(self, extra: Iterable[str]) -> "KeywordMatcher":
+        """Matcher over these keywords plus extra (e.g. job-description terms); cached."""
+        extra_key = tuple(sorted({e.lower() for e in extra if e} - set(self.keywords)))
+        if not extra_key:
+            return self
+        return _extended(self, extra_key)
+
+
+@lru_cache(maxsize=256)
+def _extended(base: KeywordMatcher, extra: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(base.keywords + extra)
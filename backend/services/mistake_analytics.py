@@ -1,58 +1,168 @@
 """
 Job application mistake analytics: aggregations by type, source, company, time.
+Aggregates are served from the day x source x mistake_type rollup, so their cost
+depends on the number of days in range rather than the number of mistakes logged.
+With MISTAKES_BACKEND=sqlite they are computed in SQL over the event store
+(backend.mistake_store) instead, which takes new events as they are ingested.
 """
+from typing import Any, Dict, List
+
 import pandas as pd
-from backend.data_loader import load_mistakes, load_mistakes_by_type
+from backend import mistake_store
+from backend.data_loader import cache_version, load_mistakes, load_mistakes_daily_rollup, slice_date_range
+from backend.metrics import timed
+from config.settings import MISTAKES_BACKEND
 
 
-def get_mistakes_filtered(
+# Columns shown in the dashboard's recent-mistakes table
+RECENT_COLUMNS = ["date", "company", "job_title", "source", "mistake_type"]
+
+
+def _filter_mistakes(
+    df: pd.DataFrame,
     start_date: pd.Timestamp = None,
     end_date: pd.Timestamp = None,
     source: str = "All",
     mistake_type: str = "All",
 ) -> pd.DataFrame:
-    """Filter mistakes by date, application source, and mistake type."""
-    df = load_mistakes().copy()
-    if start_date is not None:
-        df = df[df["date"] >= start_date]
-    if end_date is not None:
-        df = df[df["date"] <= end_date]
+    """
+    Slice the date range by binary search (df is sorted by date), then apply
+    source and mistake-type filters with a single combined mask.
+    Works on both the raw log and the daily rollup.
+    """
+    df = slice_date_range(df, start_date, end_date)
+    mask = pd.Series(True, index=df.index)
     if source and source != "All":
-        df = df[df["source"] == source]
+        mask &= df["source"] == source
     if mistake_type and mistake_type != "All":
-        df = df[df["mistake_type"] == mistake_type]
-    return df
+        mask &= df["mistake_type"] == mistake_type
+    if mask.all():
+        return df
+    return df[mask]
+
+
+def _end_of_day(end_date: pd.Timestamp = None) -> pd.Timestamp:
+    """Widen an end bound to the end of its day, matching the rollup's day granularity."""
+    if end_date is None:
+        return None
+    return pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
 
 
+def _use_store() -> bool:
+    return MISTAKES_BACKEND == "sqlite"
+
+
+def mistakes_version() -> str:
+    """Identifies the data behind the mistake aggregates (for cache keys / ETags)."""
+    return mistake_store.store_version() if _use_store() else cache_version()
+
+
+def _rollup_filtered(
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    source: str = "All",
+    mistake_type: str = "All",
+) -> pd.DataFrame:
+    return _filter_mistakes(load_mistakes_daily_rollup(), start_date, _end_of_day(end_date), source, mistake_type)
+
+
+def _count_by(rollup: pd.DataFrame, column: str) -> pd.DataFrame:
+    # column is categorical, so this groups on integer codes
+    return rollup.groupby(column, observed=True)["count"].sum().sort_values(ascending=False).reset_index()
+
+
+def _time_series(rollup: pd.DataFrame, freq: str) -> pd.DataFrame:
+    return rollup.set_index("date")[["count"]].resample(freq).sum().reset_index()
+
+
+@timed("service")
+def get_mistakes_filtered(
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    source: str = "All",
+    mistake_type: str = "All",
+    columns: List[str] = None,
+) -> pd.DataFrame:
+    """Filter mistakes by date, application source, and mistake type (only reading partitions in range)."""
+    if columns is not None:
+        columns = list(dict.fromkeys([*columns, "source", "mistake_type"]))
+    if _use_store():
+        return mistake_store.query_events(start_date, end_date, source, mistake_type, columns)
+    df = load_mistakes(start_date, end_date, columns=columns)
+    return _filter_mistakes(df, start_date, end_date, source, mistake_type)
+
+
+@timed("service")
 def get_mistakes_by_type_df(
     start_date: pd.Timestamp = None,
     end_date: pd.Timestamp = None,
+    source: str = "All",
+    mistake_type: str = "All",
 ) -> pd.DataFrame:
     """Count of mistakes by type (for bar/pie charts)."""
-    df = get_mistakes_filtered(start_date=start_date, end_date=end_date)
-    return df.groupby("mistake_type", as_index=False).agg(count=("id", "count")).sort_values(
-        "count", ascending=False
-    )
+    if _use_store():
+        return mistake_store.count_by("mistake_type", start_date, _end_of_day(end_date), source, mistake_type)
+    return _count_by(_rollup_filtered(start_date, end_date, source, mistake_type), "mistake_type")
 
 
+@timed("service")
 def get_mistakes_by_source_df(
     start_date: pd.Timestamp = None,
     end_date: pd.Timestamp = None,
+    source: str = "All",
+    mistake_type: str = "All",
 ) -> pd.DataFrame:
     """Count by application source (LinkedIn vs others)."""
-    df = get_mistakes_filtered(start_date=start_date, end_date=end_date)
-    return df.groupby("source", as_index=False).agg(count=("id", "count")).sort_values(
-        "count", ascending=False
-    )
+    if _use_store():
+        return mistake_store.count_by("source", start_date, _end_of_day(end_date), source, mistake_type)
+    return _count_by(_rollup_filtered(start_date, end_date, source, mistake_type), "source")
 
 
+@timed("service")
 def get_mistakes_time_series(
     start_date: pd.Timestamp = None,
     end_date: pd.Timestamp = None,
     freq: str = "W",
+    source: str = "All",
+    mistake_type: str = "All",
 ) -> pd.DataFrame:
     """Mistakes over time (weekly or daily) for trend line."""
-    df = get_mistakes_filtered(start_date=start_date, end_date=end_date)
-    df = df.set_index("date").resample(freq).agg({"id": "count"}).reset_index()
-    df = df.rename(columns={"id": "count"})
-    return df
+    if _use_store():
+        return _time_series(mistake_store.daily_counts(start_date, _end_of_day(end_date), source, mistake_type), freq)
+    return _time_series(_rollup_filtered(start_date, end_date, source, mistake_type), freq)
+
+
+@timed("service")
+def get_mistakes_summary(
+    start_date: pd.Timestamp = None,
+    end_date: pd.Timestamp = None,
+    source: str = "All",
+    mistake_type: str = "All",
+    freq: str = "W",
+    top_n: int = 15,
+) -> Dict[str, Any]:
+    """
+    Everything the mistakes dashboard needs from one filter pass over the rollup:
+    by_type, by_source, time_series, plus the top_n most recent raw rows (recent).
+    """
+    if _use_store():
+        end = _end_of_day(end_date)
+        return {
+            "by_type": mistake_store.count_by("mistake_type", start_date, end, source, mistake_type),
+            "by_source": mistake_store.count_by("source", start_date, end, source, mistake_type),
+            "time_series": _time_series(mistake_store.daily_counts(start_date, end, source, mistake_type), freq),
+            "recent": mistake_store.query_events(
+                start_date, end, source, mistake_type, RECENT_COLUMNS, limit=top_n, newest_first=True
+            ),
+        }
+    rollup = _rollup_filtered(start_date, end_date, source, mistake_type)
+    raw = get_mistakes_filtered(
+        start_date, _end_of_day(end_date), source, mistake_type, columns=RECENT_COLUMNS
+    )
+    return {
+        "by_type": _count_by(rollup, "mistake_type"),
+        "by_source": _count_by(rollup, "source"),
+        "time_series": _time_series(rollup, freq),
+        # Log is sorted by date, so the most recent rows are the tail
+        "recent": raw.iloc[::-1].head(top_n),
+    }
@@ -1,18 +1,46 @@
 """
 Resume analysis: parse PDF/DOCX, extract text, suggest improvements (keywords, ATS).
 """
+import io
+import os
 import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import BinaryIO, Dict, Iterator, List, Any, Optional, Union
+
+from backend.services.keyword_matcher import KeywordMatcher
+from backend.metrics import observe, timed
+from config.settings import (
+    METRICS_ENABLED,
+    UPLOADS_DIR,
+    UPLOAD_SPILL_BYTES,
+    RESUME_PDF_MAX_PAGES,
+    RESUME_PDF_MAX_CHARS,
+    RESUME_PDF_TIME_BUDGET_SECONDS,
+)
+
+
+# pdfplumber and python-docx are slow to import; load them on first extraction
+@lru_cache(maxsize=None)
+def _pdfplumber():
+    try:
+        import pdfplumber
+    except ImportError:
+        return None
+    return pdfplumber
+
+
+@lru_cache(maxsize=None)
+def _docx_document():
+    try:
+        from docx import Document
+    except ImportError:
+        return None
+    return Document
 
-try:
-    import pdfplumber
-except ImportError:
-    pdfplumber = None
-try:
-    from docx import Document as DocxDocument
-except ImportError:
-    DocxDocument = None
 
 # F1/H1B-friendly and ATS keywords (sample; extend as needed)
 F1_KEYWORDS = [
@@ -24,37 +52,92 @@ COMMON_SKILL_KEYWORDS = [
     "Excel", "Tableau", "Power BI", "communication", "leadership", "project management",
     "agile", "scrum", "Git", "AWS", "cloud", "REST API", "statistics",
 ]
+# Phrases the suggestion rules look for
+WORK_AUTH_CUES = ["work authorization", "authorized", "eligib"]
+SUMMARY_CUES = ["objective", "summary"]
+
+# Built once per process; extended with job-description terms per request
+_BASE_MATCHER = KeywordMatcher(COMMON_SKILL_KEYWORDS + F1_KEYWORDS + WORK_AUTH_CUES + SUMMARY_CUES)
 
 
-def _extract_text_pdf(file_path: Path) -> str:
-    """Extract text from PDF using pdfplumber."""
+@dataclass
+class PdfExtractionReport:
+    """Per-page extraction timings, and which limit ended extraction early (None if every page was read)."""
+    page_seconds: List[float] = field(default_factory=list)
+    chars: int = 0
+    stopped: Optional[str] = None  # "max_pages", "max_chars" or "time_budget"
+
+
+def iter_pdf_pages(
+    source: Union[Path, BinaryIO],
+    max_pages: int = RESUME_PDF_MAX_PAGES,
+    max_chars: int = RESUME_PDF_MAX_CHARS,
+    time_budget: float = RESUME_PDF_TIME_BUDGET_SECONDS,
+    report: Optional[PdfExtractionReport] = None,
+) -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order, stopping after max_pages, once
+    max_chars have been gathered (the last page is cut to fit) or when
+    time_budget seconds have passed. The budget is checked between pages.
+    Only the first max_pages + 1 pages are parsed, and each page's layout
+    objects are released before the next one is read.
+    """
+    pdfplumber = _pdfplumber()
     if not pdfplumber:
-        return ""
-    text_parts = []
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            t = page.extract_text()
-            if t:
-                text_parts.append(t)
-    return "\n".join(text_parts)
+        return
+    report = report if report is not None else PdfExtractionReport()
+    deadline = time.perf_counter() + time_budget
+    # One page past the limit tells a truncated document from one of exactly max_pages
+    with pdfplumber.open(source, pages=list(range(1, max_pages + 2))) as pdf:
+        for number, page in enumerate(pdf.pages, start=1):
+            if number > max_pages:
+                report.stopped = "max_pages"
+                return
+            t0 = time.perf_counter()
+            try:
+                text = page.extract_text() or ""
+            finally:
+                page.close()
+            elapsed = time.perf_counter() - t0
+            report.page_seconds.append(elapsed)
+            if METRICS_ENABLED:
+                observe("resume_pdf_page_seconds", elapsed, "Text extraction time per PDF page")
+            if report.chars + len(text) >= max_chars:
+                text = text[: max_chars - report.chars]
+                report.stopped = "max_chars"
+            report.chars += len(text)
+            if text:
+                yield text
+            if report.stopped:
+                return
+            if time.perf_counter() >= deadline:
+                report.stopped = "time_budget"
+                return
 
 
-def _extract_text_docx(file_path: Path) -> str:
-    """Extract text from DOCX."""
+def _extract_text_pdf(source: Union[Path, BinaryIO], report: Optional[PdfExtractionReport] = None) -> str:
+    """Extract text from PDF (path or binary file object) using pdfplumber, within the page/char/time limits."""
+    return "\n".join(iter_pdf_pages(source, report=report))
+
+
+def _extract_text_docx(source: Union[Path, BinaryIO]) -> str:
+    """Extract text from DOCX (path or binary file object)."""
+    DocxDocument = _docx_document()
     if not DocxDocument:
         return ""
-    doc = DocxDocument(file_path)
+    doc = DocxDocument(source)
     return "\n".join(p.text for p in doc.paragraphs)
 
 
-def extract_resume_text(file_path: Path) -> str:
-    """Extract raw text from resume (PDF or DOCX)."""
+@timed("service")
+def extract_resume_text(file_path: Path, report: Optional[PdfExtractionReport] = None) -> str:
+    """Extract raw text from resume (PDF or DOCX). PDF page timings go to report if given."""
     path = Path(file_path)
     if not path.exists():
         return ""
     suf = path.suffix.lower()
     if suf == ".pdf":
-        return _extract_text_pdf(path)
+        return _extract_text_pdf(path, report)
     if suf in (".docx", ".doc"):
         return _extract_text_docx(path)
     if suf == ".txt":
@@ -62,34 +145,76 @@ def extract_resume_text(file_path: Path) -> str:
     return ""
 
 
+def _extract_text_stream(stream: BinaryIO, suffix: str, report: Optional[PdfExtractionReport] = None) -> str:
+    if suffix == ".pdf":
+        return _extract_text_pdf(stream, report)
+    if suffix in (".docx", ".doc"):
+        return _extract_text_docx(stream)
+    if suffix == ".txt":
+        return stream.read().decode("utf-8", errors="ignore")
+    return ""
+
+
+@timed("service")
+def extract_resume_text_from_bytes(
+    data: bytes,
+    suffix: str,
+    spill_bytes: int = UPLOAD_SPILL_BYTES,
+    report: Optional[PdfExtractionReport] = None,
+) -> str:
+    """
+    Extract raw text from resume file bytes (PDF, DOCX or TXT, chosen by suffix).
+    Parsed from memory; uploads larger than spill_bytes go through a unique temp
+    file instead, so concurrent requests never share a path. PDF page timings go to report if given.
+    """
+    suf = (suffix or "").lower()
+    if not data:
+        return ""
+    if len(data) <= spill_bytes:
+        return _extract_text_stream(io.BytesIO(data), suf, report)
+    UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=UPLOADS_DIR, suffix=suf)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with open(tmp, "rb") as f:
+            return _extract_text_stream(f, suf, report)
+    finally:
+        os.remove(tmp)
+
+
+@timed("service")
 def analyze_resume(text: str, job_description: str = "") -> Dict[str, Any]:
     """
     Analyze resume text and return scores + suggestions.
     - ats_score: rough keyword match (0-100)
     - f1_score: presence of work-auth/sponsorship keywords
     - suggestions: list of strings
-    - keywords_found / keywords_missing
+    - keywords_found / keywords_missing (keyword_counts: occurrences of each found keyword)
     """
-    text_lower = (text or "").lower()
+    text = text or ""
     jd_lower = (job_description or "").lower()
-    all_keywords = list(set(COMMON_SKILL_KEYWORDS + F1_KEYWORDS + re.findall(r"\b[a-z]{4,}\b", jd_lower)[:30]))
+    jd_terms = re.findall(r"\b[a-z]{4,}\b", jd_lower)[:30]
+    all_keywords = list(set(COMMON_SKILL_KEYWORDS + F1_KEYWORDS + jd_terms))
+
+    # One pass over the resume finds every keyword, cue and JD term
+    counts = _BASE_MATCHER.extend(jd_terms).count_all(text)
 
-    keywords_found = [k for k in all_keywords if k.lower() in text_lower]
-    keywords_missing = [k for k in COMMON_SKILL_KEYWORDS + F1_KEYWORDS if k.lower() not in text_lower][:20]
+    keywords_found = [k for k in all_keywords if k.lower() in counts]
+    keywords_missing = [k for k in COMMON_SKILL_KEYWORDS + F1_KEYWORDS if k.lower() not in counts][:20]
 
     # ATS-style score: share of common + JD keywords found
-    relevant = [k for k in all_keywords if k.lower() in (text_lower + " " + jd_lower)]
     ats_score = min(100, int(50 + 50 * len(keywords_found) / max(1, len(set(COMMON_SKILL_KEYWORDS + F1_KEYWORDS)))))
 
-    f1_found = [k for k in F1_KEYWORDS if k.lower() in text_lower]
+    f1_found = [k for k in F1_KEYWORDS if k.lower() in counts]
     f1_score = min(100, int(30 + 70 * len(f1_found) / max(1, len(F1_KEYWORDS))))
 
     suggestions = []
-    if not any(k in text_lower for k in ["work authorization", "authorized", "eligib"]):
+    if not any(k in counts for k in WORK_AUTH_CUES):
         suggestions.append("Add a clear 'Work Authorization' or 'Eligibility to Work' line (e.g., F1 OPT, H1B).")
     if len(text.strip()) < 200:
         suggestions.append("Resume may be too short; add more bullet points for projects and experience.")
-    if "objective" not in text_lower and "summary" not in text_lower:
+    if not any(k in counts for k in SUMMARY_CUES):
         suggestions.append("Consider adding a short Professional Summary or Objective at the top.")
     for kw in keywords_missing[:5]:
         if kw in COMMON_SKILL_KEYWORDS:
@@ -100,6 +225,7 @@ def analyze_resume(text: str, job_description: str = "") -> Dict[str, Any]:
         "f1_score": f1_score,
         "word_count": len(text.split()),
         "keywords_found": keywords_found[:30],
+        "keyword_counts": {k: counts[k.lower()] for k in keywords_found[:30]},
         "keywords_missing": keywords_missing[:15],
         "f1_keywords_found": f1_found,
         "suggestions": suggestions[:10],
@@ -0,0 +1,162 @@
+"""
+Content-addressed caches for the candidate analysis page.
+
+- Extracted resume text is stored on disk under RESUME_TEXT_CACHE_DIR, keyed by
+  the SHA-256 of the uploaded file bytes, the file suffix (which picks the
+  extractor) and the PDF extraction limits, with
+  size-bounded LRU eviction (file mtime is the recency stamp). Re-analyzing the
+  same file skips PDF parsing. An entry's first line records which limit cut the
+  extraction short (if any), so hits can report it. Text cut short by the time
+  budget is not cached.
+- Analysis results are kept in an in-process LRU keyed by (text hash, JD hash).
+"""
+import copy
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import (
+    RESUME_TEXT_CACHE_DIR,
+    RESUME_TEXT_CACHE_MAX_BYTES,
+    RESUME_ANALYSIS_CACHE_SIZE,
+    RESUME_PDF_MAX_PAGES,
+    RESUME_PDF_MAX_CHARS,
+    RESUME_PDF_TIME_BUDGET_SECONDS,
+)
+from backend.services.resume_analyzer import PdfExtractionReport, analyze_resume
+from backend.metrics import timed
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _text_hash(text: str) -> str:
+    return content_hash((text or "").encode("utf-8"))
+
+
+# First line of every text cache entry: "#stopped=<PdfExtractionReport.stopped or empty>"
+_HEADER_PREFIX = "#stopped="
+# Part of every text cache key: changing a limit must not serve text extracted under the old one
+_LIMITS_TAG = f"p{RESUME_PDF_MAX_PAGES}-c{RESUME_PDF_MAX_CHARS}-t{RESUME_PDF_TIME_BUDGET_SECONDS:g}"
+
+
+def cache_path(data: bytes, suffix: str, cache_dir: Optional[Path] = None) -> Path:
+    """
+    Text cache entry for these upload bytes read as suffix (".pdf", ".docx", ...) under
+    the current limits. cache_dir defaults to RESUME_TEXT_CACHE_DIR, looked up per call.
+    """
+    kind = (suffix or "").lower().lstrip(".") or "unknown"
+    return Path(cache_dir or RESUME_TEXT_CACHE_DIR) / f"{content_hash(data)}-{kind}-{_LIMITS_TAG}.txt"
+
+
+def _evict_text_cache(cache_dir: Path, max_bytes: int) -> None:
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as it:
+        for e in it:
+            if e.is_file() and e.name.endswith(".txt"):
+                st = e.stat()
+                entries.append((st.st_mtime_ns, st.st_size, e.path))
+                total += st.st_size
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+@timed("service")
+def cached_extract_text(
+    data: bytes,
+    suffix: str,
+    extract: Callable[[bytes, PdfExtractionReport], str],
+    cache_dir: Optional[Path] = None,
+    max_bytes: int = RESUME_TEXT_CACHE_MAX_BYTES,
+    report: Optional[PdfExtractionReport] = None,
+) -> str:
+    """
+    Return extract(data, report), served from the on-disk cache when these exact bytes
+    were seen before with the same suffix and extraction limits (report then gets only
+    the stored stopped reason, no page timings).
+    Text cut short by the time budget depends on machine load, so it is never cached.
+    Writes are atomic (temp file + rename), so concurrent workers can share the directory.
+    """
+    entry = cache_path(data, suffix, cache_dir)
+    cache_dir = entry.parent
+    report = report if report is not None else PdfExtractionReport()
+    try:
+        header, _, text = entry.read_text(encoding="utf-8").partition("\n")
+        os.utime(entry)  # mark as recently used
+    except OSError:
+        pass
+    else:
+        if header.startswith(_HEADER_PREFIX):
+            report.stopped = header[len(_HEADER_PREFIX):] or None
+            return text
+
+    text = extract(data, report)
+    if not text.strip() or report.stopped == "time_budget":
+        return text
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(f"{_HEADER_PREFIX}{report.stopped or ''}\n")
+            f.write(text)
+        os.replace(tmp, entry)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return text
+    _evict_text_cache(cache_dir, max_bytes)
+    return text
+
+
+class _AnalysisCache:
+    """Thread-safe LRU of analyze_resume results keyed by (text hash, JD hash)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
+    def get_or_compute(self, text: str, job_description: str) -> Dict[str, Any]:
+        key = (_text_hash(text), _text_hash(job_description))
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                return copy.deepcopy(result)
+        result = analyze_resume(text, job_description)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_ANALYSIS_CACHE = _AnalysisCache(RESUME_ANALYSIS_CACHE_SIZE)
+
+
+@timed("service")
+def cached_analyze_resume(text: str, job_description: str = "") -> Dict[str, Any]:
+    """analyze_resume, memoized by (text hash, JD hash)."""
+    return _ANALYSIS_CACHE.get_or_compute(text, job_description or "")
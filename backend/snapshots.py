@@ -0,0 +1,166 @@
+"""
+Versioned snapshots of processed data.
+
+The refresh writes every output into a fresh directory under SNAPSHOTS_DIR and
+then publishes it by atomically replacing CURRENT_SNAPSHOT_MANIFEST (a small
+JSON file naming the version). Readers resolve dataset paths through the
+manifest, so they always see one complete snapshot and pick up new versions
+without a restart. Without a manifest, the legacy flat PROCESSED_DIR layout is used.
+
+A request or callback that loads several datasets pins one manifest read with
+pin()/unpin() or `with pinned():`, so a publish landing mid-request cannot make it
+read some datasets from the old snapshot and others from the new one.
+"""
+import contextvars
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from config.settings import PROCESSED_DIR, SNAPSHOTS_DIR, CURRENT_SNAPSHOT_MANIFEST, SNAPSHOTS_TO_KEEP
+
+_lock = threading.Lock()
+_manifest_cache: Dict[str, object] = {"signature": None, "manifest": None}
+# (version,) of the snapshot this context is pinned to; None when unpinned
+_pinned: contextvars.ContextVar[Optional[tuple]] = contextvars.ContextVar("pinned_snapshot", default=None)
+
+
+def read_manifest() -> Optional[dict]:
+    """Published manifest ({"version", "published_at", "files"}), or None. Re-read only when it changes."""
+    try:
+        st = CURRENT_SNAPSHOT_MANIFEST.stat()
+    except OSError:
+        return None
+    sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _lock:
+        if _manifest_cache["signature"] == sig:
+            return _manifest_cache["manifest"]
+    try:
+        manifest = json.loads(CURRENT_SNAPSHOT_MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    with _lock:
+        _manifest_cache["signature"] = sig
+        _manifest_cache["manifest"] = manifest
+    return manifest
+
+
+def current_version() -> Optional[str]:
+    """Version id of the published snapshot, or of the pinned one inside pin() (None for the legacy flat layout)."""
+    pinned_version = _pinned.get()
+    if pinned_version is not None:
+        return pinned_version[0]
+    return _published_version()
+
+
+def _published_version() -> Optional[str]:
+    manifest = read_manifest()
+    return manifest["version"] if manifest else None
+
+
+def pin() -> contextvars.Token:
+    """
+    Resolve dataset paths in this context against the currently published snapshot
+    until unpin(token), however many publishes happen meanwhile. Nested pins keep the outer version.
+    """
+    return _pinned.set((current_version(),))
+
+
+def unpin(token: contextvars.Token) -> None:
+    _pinned.reset(token)
+
+
+@contextmanager
+def pinned() -> Iterator[Optional[str]]:
+    """pin() for the duration of the block; yields the pinned version."""
+    token = pin()
+    try:
+        yield current_version()
+    finally:
+        unpin(token)
+
+
+def snapshot_dir(version: Optional[str]) -> Path:
+    return SNAPSHOTS_DIR / version if version else PROCESSED_DIR
+
+
+def current_dir() -> Path:
+    """Directory holding the currently published datasets."""
+    return snapshot_dir(current_version())
+
+
+def resolve(path: Path) -> Path:
+    """Map a processed-data path from config.settings onto the published snapshot."""
+    return current_dir() / Path(path).name
+
+
+def new_snapshot_dir() -> Path:
+    """Create an empty, unpublished snapshot directory for a refresh to write into."""
+    version = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+    path = SNAPSHOTS_DIR / version
+    path.mkdir(parents=True, exist_ok=False)
+    return path
+
+
+def carry_over(src: Path, dst: Path, names: Optional[Iterable[str]] = None) -> None:
+    """
+    Hard-link (or copy) files and partitioned dataset directories from one snapshot
+    into another, so skipped steps keep their previous outputs and partitioned
+    datasets keep their history. Writers must replace, not truncate, these files.
+    """
+    if not src.exists():
+        return
+    wanted = set(names) if names is not None else None
+    for f in src.iterdir():
+        if wanted is not None and f.name not in wanted:
+            continue
+        target = dst / f.name
+        if target.exists():
+            continue
+        if f.is_dir():
+            shutil.copytree(f, target, copy_function=_link_or_copy)
+        elif f.is_file():
+            _link_or_copy(f, target)
+
+
+def _link_or_copy(src, dst) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def publish(path: Path) -> dict:
+    """Atomically make the snapshot at path the current one, then prune old snapshots."""
+    manifest = {
+        "version": path.name,
+        "published_at": datetime.now().isoformat(),
+        "files": sorted(f.name for f in path.iterdir()),
+    }
+    tmp = CURRENT_SNAPSHOT_MANIFEST.with_suffix(f".{uuid.uuid4().hex[:6]}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, CURRENT_SNAPSHOT_MANIFEST)
+    prune()
+    return manifest
+
+
+def discard(path: Path) -> None:
+    """Remove an unpublished snapshot (e.g. after a failed refresh)."""
+    if path.parent == SNAPSHOTS_DIR and path.name != _published_version():
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def prune(keep: int = SNAPSHOTS_TO_KEEP) -> None:
+    """Delete all but the newest keep snapshots; the published one is never removed."""
+    if not SNAPSHOTS_DIR.exists():
+        return
+    current = _published_version()
+    versions = sorted(p for p in SNAPSHOTS_DIR.iterdir() if p.is_dir())
+    for p in versions[:-keep] if keep > 0 else versions:
+        if p.name != current:
+            shutil.rmtree(p, ignore_errors=True)
@@ -11,17 +11,60 @@ RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
 UPLOADS_DIR = PROJECT_ROOT / "uploads"
 
-# Ensure dirs exist
-for d in (RAW_DIR, PROCESSED_DIR, UPLOADS_DIR):
-    d.mkdir(parents=True, exist_ok=True)
+# Versioned snapshots of processed outputs; CURRENT.json names the published one
+SNAPSHOTS_DIR = PROCESSED_DIR / "snapshots"
+CURRENT_SNAPSHOT_MANIFEST = PROCESSED_DIR / "CURRENT.json"
+SNAPSHOTS_TO_KEEP = 3
 
-# Data file names (processed outputs used by dashboards)
+# Data file names (processed outputs used by dashboards; resolved inside the current snapshot)
 H1B_STATE_AGGREGATE = PROCESSED_DIR / "h1b_by_state.parquet"
 H1B_EMPLOYER_AGGREGATE = PROCESSED_DIR / "h1b_by_employer.parquet"
 JOB_POSTINGS_DAILY = PROCESSED_DIR / "job_postings_daily.parquet"
 JOB_POSTINGS_BY_STATE = PROCESSED_DIR / "job_postings_by_state.parquet"
+JOB_POSTINGS_BY_SEGMENT = PROCESSED_DIR / "job_postings_by_segment.parquet"
+STATE_METRICS_CUBE = PROCESSED_DIR / "state_metrics_cube.parquet"
 MISTAKES_AGGREGATE = PROCESSED_DIR / "job_application_mistakes.parquet"
-MISTAKES_BY_TYPE = PROCESSED_DIR / "mistakes_by_type.parquet"
+MISTAKES_DAILY_ROLLUP = PROCESSED_DIR / "mistakes_daily_rollup.parquet"
+# The refresh also writes an uncompressed Arrow IPC (Feather v2) copy of each parquet file;
+# loaders memory-map it, so workers on a host share one page-cache copy of each dataset
+WRITE_ARROW_MIRRORS = os.environ.get("WRITE_ARROW_MIRRORS", "1").lower() in ("1", "true", "yes")
+ARROW_SUFFIX = ".arrow"
+# User-submitted mistake events (SQLite, WAL). MISTAKES_BACKEND=sqlite serves the
+# mistake aggregates from this store instead of the refreshed parquet log
+MISTAKES_DB = Path(os.environ.get("MISTAKES_DB", DATA_DIR / "mistakes.sqlite"))
+MISTAKES_INGEST_BATCH = int(os.environ.get("MISTAKES_INGEST_BATCH", 5000))
+MISTAKES_BACKEND = os.environ.get("MISTAKES_BACKEND", "parquet").lower()
+# Raw exports dropped into RAW_DIR are streamed in chunks of RAW_CHUNK_ROWS rows
+RAW_POSTINGS_PATTERN = "postings*"
+RAW_CHUNK_ROWS = int(os.environ.get("RAW_CHUNK_ROWS", 200_000))
+# DOL LCA / USCIS H-1B disclosure files; parsed in RAW_BLOCK_BYTES blocks across processes
+RAW_H1B_PATTERN = "h1b*"
+RAW_BLOCK_BYTES = int(os.environ.get("RAW_BLOCK_BYTES", 32 * 1024 * 1024))
+# Input fingerprints of the last refresh run (lets unchanged steps be skipped)
+REFRESH_STATE_FILE = PROCESSED_DIR / "_refresh_state.json"
+
+# Resume caches (content-addressed extracted text on disk, analysis results in memory)
+RESUME_TEXT_CACHE_DIR = UPLOADS_DIR / "text_cache"
+RESUME_TEXT_CACHE_MAX_BYTES = int(os.environ.get("RESUME_TEXT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+RESUME_ANALYSIS_CACHE_SIZE = 1024
+# Uploads are parsed in memory; larger ones spill to a unique temp file under UPLOADS_DIR
+UPLOAD_SPILL_BYTES = int(os.environ.get("UPLOAD_SPILL_BYTES", 16 * 1024 * 1024))
+# PDF extraction stops at whichever limit is hit first; resume scoring needs only the first few pages
+RESUME_PDF_MAX_PAGES = int(os.environ.get("RESUME_PDF_MAX_PAGES", 10))
+RESUME_PDF_MAX_CHARS = int(os.environ.get("RESUME_PDF_MAX_CHARS", 30_000))
+RESUME_PDF_TIME_BUDGET_SECONDS = float(os.environ.get("RESUME_PDF_TIME_BUDGET_SECONDS", 5.0))
+
+# Serialized Dash callback outputs (figures), shared across workers on the host
+FIGURE_CACHE_DIR = DATA_DIR / "figure_cache"
+FIGURE_CACHE_SIZE = 256
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get("FIGURE_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+
+# Opt-in instrumentation: latency histograms on /metrics, optional Server-Timing response header
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING", "").lower() in ("1", "true", "yes")
+
+# REST API (backend/api.py): threads running blocking pandas work per API process
+API_THREADS = int(os.environ.get("API_THREADS", 8))
 
 # USA state abbreviations (for choropleth)
 USA_STATES = [
@@ -33,8 +76,9 @@ USA_STATES = [
 ]
 
 # Filter options (used across dashboards)
-JOB_TYPES = ["All", "Full-time", "Part-time", "Contract", "Internship"]
-COMPANY_TYPES = ["All", "Startup", "Enterprise", "Nonprofit", "Government"]
+# "Other" holds raw postings that fit no named value (jobs/normalize.py)
+JOB_TYPES = ["All", "Full-time", "Part-time", "Contract", "Internship", "Other"]
+COMPANY_TYPES = ["All", "Startup", "Enterprise", "Nonprofit", "Government", "Other"]
 INDUSTRIES = ["All", "Technology", "Healthcare", "Finance", "Education", "Manufacturing", "Other"]
 APPLICATION_SOURCES = ["All", "LinkedIn", "Company Site", "Indeed", "Other"]
 MISTAKE_TYPES = ["Wrong page (LinkedIn form)", "Duplicate apply", "Expired posting", "Wrong job title", "Other"]
@@ -42,3 +86,9 @@ MISTAKE_TYPES = ["Wrong page (LinkedIn form)", "Duplicate apply", "Expired posti
 # Default date range (for synthetic data)
 DEFAULT_START_YEAR = 2022
 DEFAULT_END_YEAR = 2025
+
+
+def ensure_data_dirs():
+    """Create data/upload dirs. Called by writers, so importing settings has no side effects."""
+    for d in (RAW_DIR, PROCESSED_DIR, UPLOADS_DIR):
+        d.mkdir(parents=True, exist_ok=True)
@@ -2,9 +2,12 @@
 Main Dash app: multi-page routing (USA map, state detail, mistakes, H1B market, candidate analysis).
 """
 import dash
-from dash import dcc, html, Input, Output, callback
+from dash import dcc, html, Input, Output
 import dash_bootstrap_components as dbc
+from flask import g
+from backend.snapshots import pin, unpin
 from dashboards.pages import main_map, state_detail, job_mistakes, h1b_market, candidate_analysis
+from dashboards.instrumentation import install, instrument_callbacks
 
 # Bootstrap theme for clean UI
 app = dash.Dash(
@@ -13,6 +16,47 @@ app = dash.Dash(
     external_stylesheets=[dbc.themes.BOOTSTRAP],
     suppress_callback_exceptions=True,
 )
+# WSGI entry point (see wsgi.py / gunicorn.conf.py)
+server = app.server
+# Opt-in (METRICS_ENABLED=1): time every callback, expose /metrics and Server-Timing
+install(app)
+callbacks = instrument_callbacks(app)
+
+
+@server.before_request
+def _pin_snapshot():
+    """All callbacks and layouts of one request read from the same published snapshot."""
+    g.snapshot_token = pin()
+
+
+@server.teardown_request
+def _unpin_snapshot(exc):
+    token = g.pop("snapshot_token", None)
+    if token is not None:
+        unpin(token)
+
+
+@server.route("/healthz")
+def healthz():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@server.route("/readyz")
+def readyz():
+    """Readiness: 200 once processed datasets are preloaded, 503 before."""
+    from backend.data_loader import cache_stats, dataset_version, preload_status
+
+    status = preload_status()
+    body = {
+        "ready": status["loaded"],
+        "dataset_version": dataset_version(),
+        "preloaded_version": status["version"],
+        "preload_seconds": status["seconds"],
+        "cache": cache_stats(),
+    }
+    return body, (200 if status["loaded"] else 503)
+
 
 # Navigation links
 NAV = dbc.NavbarSimple(
@@ -39,7 +83,7 @@ app.layout = html.Div(
 )
 
 
-@callback(
+@callbacks.callback(
     [Output("page-content", "children"), Output("current-state", "data")],
     Input("url", "pathname"),
 )
@@ -63,19 +107,22 @@ def render_page(pathname):
 
 
 # Register all page callbacks
-main_map.register_callbacks(app)
-job_mistakes.register_callbacks(app)
-h1b_market.register_callbacks(app)
-candidate_analysis.register_callbacks(app)
+main_map.register_callbacks(callbacks)
+job_mistakes.register_callbacks(callbacks)
+h1b_market.register_callbacks(callbacks)
+candidate_analysis.register_callbacks(callbacks)
 
 
 # State detail callbacks: use current-state Store for state_abbr
 import plotly.graph_objects as go
-from backend.services.h1b_analytics import get_state_level_metrics
+from dashboards.figure_cache import cached_figures
 
 
+@cached_figures("state-view")
 def _state_view_response(state_abbr, job_type, company_type, industry):
     """Build state detail figure and metric strings."""
+    from backend.services.h1b_analytics import get_state_level_metrics
+
     state = (state_abbr or "CA").upper()
     df_all = get_state_level_metrics(
         job_type=job_type or "All",
@@ -112,7 +159,7 @@ def _state_view_response(state_abbr, job_type, company_type, industry):
     )
 
 
-@callback(
+@callbacks.callback(
     [
         Output("state-heatmap", "figure"),
         Output("state-job-count", "children"),
@@ -127,7 +174,7 @@ def _state_view_response(state_abbr, job_type, company_type, industry):
 def update_state_view(state_abbr, job_type, company_type, industry):
     if not state_abbr:
         return go.Figure(), "—", "—", "—"
-    return _state_view_response(state_abbr, job_type, company_type, industry)
+    return _state_view_response(state_abbr.upper(), job_type or "All", company_type or "All", industry or "All")
 
 
 # Click on USA map -> navigate to state detail (clientside)
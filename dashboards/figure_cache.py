@@ -0,0 +1,137 @@
+"""
+Memoization for figure-producing callback bodies.
+
+Results are keyed by (callback name, dataset version, arguments). Each worker keeps
+an in-memory LRU; serialized JSON is also written to FIGURE_CACHE_DIR so other
+Gunicorn workers on the host reuse it. Repeat views skip pandas and Plotly
+construction entirely. Cached values are returned in JSON form (figures as dicts,
+components as their props dicts), which Dash accepts as callback outputs.
+"""
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+from plotly.utils import PlotlyJSONEncoder
+
+from backend.metrics import stage
+from config.settings import FIGURE_CACHE_DIR, FIGURE_CACHE_SIZE, FIGURE_CACHE_MAX_BYTES
+
+_lock = threading.Lock()
+_memory: "OrderedDict[str, Any]" = OrderedDict()
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def _version() -> str:
+    from backend.data_loader import cache_version  # imports pandas; keep app startup light
+
+    return cache_version()
+
+
+def _key(name: str, args: tuple) -> str:
+    raw = json.dumps([name, _version(), list(args)], default=str, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _remember(key: str, value: Any) -> None:
+    with _lock:
+        _memory[key] = value
+        _memory.move_to_end(key)
+        while len(_memory) > FIGURE_CACHE_SIZE:
+            _memory.popitem(last=False)
+
+
+def _read_disk(key: str):
+    path = FIGURE_CACHE_DIR / f"{key}.json"
+    try:
+        payload = path.read_text(encoding="utf-8")
+        os.utime(path)  # mark as recently used
+    except OSError:
+        return None
+    try:
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def _write_disk(key: str, payload: str) -> None:
+    try:
+        FIGURE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=FIGURE_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, FIGURE_CACHE_DIR / f"{key}.json")
+    except OSError:
+        return
+    _evict_disk()
+
+
+def _evict_disk() -> None:
+    """Delete least recently used entries until the directory fits in FIGURE_CACHE_MAX_BYTES."""
+    entries = []
+    with os.scandir(FIGURE_CACHE_DIR) as it:
+        for e in it:
+            if e.is_file() and e.name.endswith(".json"):
+                st = e.stat()
+                entries.append((st.st_mtime_ns, st.st_size, e.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= FIGURE_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def cached_figures(name: str) -> Callable:
+    """Decorator: memoize a function of JSON-able filter values that returns figures/components."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key = _key(name, args)
+            with _lock:
+                if key in _memory:
+                    _memory.move_to_end(key)
+                    _stats["hits"] += 1
+                    return _memory[key]
+            value = _read_disk(key)
+            if value is not None:
+                with _lock:
+                    _stats["disk_hits"] += 1
+                _remember(key, value)
+                return value
+            with stage("build"):
+                result = fn(*args)
+            with stage("serialize"):
+                payload = json.dumps(result, cls=PlotlyJSONEncoder)
+                # Return the JSON form on a miss too, so hits and misses look the same to Dash
+                value = json.loads(payload)
+            with _lock:
+                _stats["misses"] += 1
+            _remember(key, value)
+            _write_disk(key, payload)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def figure_cache_stats() -> dict:
+    with _lock:
+        return {**_stats, "entries": len(_memory)}
+
+
+def clear_figure_cache(disk: bool = False) -> None:
+    with _lock:
+        _memory.clear()
+    if disk and FIGURE_CACHE_DIR.exists():
+        for f in Path(FIGURE_CACHE_DIR).glob("*.json"):
+            f.unlink(missing_ok=True)
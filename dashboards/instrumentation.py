@@ -0,0 +1,96 @@
+"""
+Dash side of backend.metrics: callback timing, response sizes, /metrics and Server-Timing.
+
+instrument_callbacks(app) returns an object with the app's .callback signature
+that times every registered callback body; install(app) adds the request hooks
+and the /metrics endpoint. Both are no-ops unless METRICS_ENABLED is set.
+"""
+import functools
+import time
+from typing import Callable
+
+from flask import Response, g, request
+
+from backend import metrics
+from config.settings import METRICS_ENABLED, SERVER_TIMING_ENABLED
+
+# Dash posts every server-side callback invocation to this endpoint
+_UPDATE_COMPONENT = "_dash-update-component"
+
+
+def timed_callback(fn: Callable) -> Callable:
+    """Record the callback body's duration under its function name."""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        scope = metrics.current_scope()
+        if scope is not None:
+            scope.callback = name
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - t0
+            metrics.observe("dash_callback_duration_seconds", elapsed, "Dash callback body latency", callback=name)
+            if scope is not None:
+                scope.add("callback", elapsed)
+
+    return wrapper
+
+
+class _InstrumentedApp:
+    """Stands in for the Dash app in register_callbacks(); other attributes pass through."""
+
+    def __init__(self, app):
+        self._app = app
+
+    def callback(self, *args, **kwargs):
+        register = self._app.callback(*args, **kwargs)
+        return lambda fn: register(timed_callback(fn))
+
+    def __getattr__(self, name):
+        return getattr(self._app, name)
+
+
+def instrument_callbacks(app):
+    """The app itself when metrics are disabled, else a proxy whose .callback times each callback."""
+    return _InstrumentedApp(app) if METRICS_ENABLED else app
+
+
+def install(app) -> None:
+    """Add per-request timing hooks and the Prometheus /metrics endpoint to app's Flask server."""
+    if not METRICS_ENABLED:
+        return
+    server = app.server
+
+    @server.before_request
+    def _open_scope():
+        if request.path.endswith(_UPDATE_COMPONENT):
+            g.metrics_token = metrics.open_scope()
+
+    @server.after_request
+    def _record_request(response):
+        scope = metrics.current_scope()
+        if scope is None:
+            return response
+        elapsed = time.perf_counter() - scope.started
+        metrics.observe("dash_request_duration_seconds", elapsed,
+                        "Callback request latency including Dash serialization", callback=scope.callback)
+        metrics.observe("dash_response_bytes", response.calculate_content_length() or 0,
+                        "Callback response payload size", metrics.BYTE_BUCKETS, callback=scope.callback)
+        if SERVER_TIMING_ENABLED:
+            scope.add("total", elapsed)
+            response.headers["Server-Timing"] = scope.server_timing()
+        return response
+
+    @server.teardown_request
+    def _close_scope(exc):
+        token = g.pop("metrics_token", None)
+        if token is not None:
+            metrics.close_scope(token)
+
+    @server.route("/metrics")
+    def prometheus_metrics():
+        """Histograms of this worker process in Prometheus text format."""
+        return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
@@ -2,12 +2,20 @@
 Candidate analysis dashboard: upload resume, get scores and suggestions.
 """
 import dash_bootstrap_components as dbc
-from dash import dcc, html, Input, Output, State, callback
-from pathlib import Path
+from dash import dcc, html, Input, Output, State
 import base64
-import io
-from backend.services.resume_analyzer import extract_resume_text, analyze_resume
-from config.settings import UPLOADS_DIR
+from backend.services.resume_analyzer import PdfExtractionReport, extract_resume_text_from_bytes
+from backend.services.resume_cache import cached_extract_text, cached_analyze_resume
+from config.settings import RESUME_PDF_MAX_PAGES, RESUME_PDF_MAX_CHARS
+
+
+def _stopped_note(report: PdfExtractionReport) -> str:
+    """Why PDF extraction stopped before the end of the document."""
+    if report.stopped == "max_pages":
+        return f"Only the first {RESUME_PDF_MAX_PAGES} pages were read (page limit reached)."
+    if report.stopped == "max_chars":
+        return f"Only the first {RESUME_PDF_MAX_CHARS:,} characters were read (length limit reached)."
+    return f"Only the first {len(report.page_seconds)} page(s) were read (time limit reached)."
 
 
 def layout():
@@ -55,16 +63,14 @@ def layout():
 
 
 def parse_upload(contents):
-    """Decode upload and save to temp file; return path."""
+    """Decode upload; return (file bytes, suffix)."""
     if not contents:
         return None
     try:
         content_type, content_string = contents.split(",")
         decoded = base64.b64decode(content_string)
         suffix = ".pdf" if "pdf" in content_type else ".docx"
-        path = UPLOADS_DIR / f"upload{suffix}"
-        path.write_bytes(decoded)
-        return path
+        return decoded, suffix
     except Exception:
         return None
 
@@ -89,13 +95,18 @@ def register_callbacks(app):
     def run_analysis(n_clicks, contents, jd):
         if not n_clicks or not contents:
             return html.Div("Upload a resume and click Analyze.")
-        path = parse_upload(contents)
-        if not path:
+        upload = parse_upload(contents)
+        if not upload:
             return html.Div("Could not read file. Use PDF or DOCX.")
-        text = extract_resume_text(path)
+        data, suffix = upload
+        # Same file bytes -> cached text (no PDF parsing); same text + JD -> cached result
+        report = PdfExtractionReport()
+        text = cached_extract_text(
+            data, suffix, lambda d, r: extract_resume_text_from_bytes(d, suffix, report=r), report=report
+        )
         if not text.strip():
             return html.Div("No text extracted. Check file format.")
-        result = analyze_resume(text, jd or "")
+        result = cached_analyze_resume(text, jd or "")
         cards = [
             dbc.Card(
                 [dbc.CardBody([html.H6("ATS-style score"), html.H4(f"{result['ats_score']}/100")])],
@@ -114,8 +125,11 @@ def register_callbacks(app):
         suggestion_list = html.Ul([html.Li(s) for s in suggestions]) if suggestions else html.P("No specific suggestions.")
         keywords_found = result.get("keywords_found", [])[:15]
         keywords_missing = result.get("keywords_missing", [])[:10]
+        # Set on cache hits too (the text cache stores the reason); time-budget cuts are never cached
+        stopped_note = html.P(_stopped_note(report), className="small text-muted") if report.stopped else None
         return html.Div(
             [
+                stopped_note,
                 html.H5("Scores"),
                 dbc.Row([dbc.Col(c, width=4) for c in cards]),
                 html.H5("Suggestions", className="mt-3"),
@@ -4,14 +4,7 @@ F1/H1B job market dashboard: daily job trends, top states, H1B metrics.
 import dash_bootstrap_components as dbc
 from dash import dcc, html, Input, Output, callback
 import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from backend.services.h1b_analytics import (
-    get_daily_job_trends,
-    get_top_states_by_jobs,
-    get_top_states_by_h1b,
-    get_state_level_metrics,
-)
+from dashboards.figure_cache import cached_figures
 
 
 def layout():
@@ -43,6 +36,51 @@ def layout():
     )
 
 
+@cached_figures("h1b-market")
+def h1b_market_outputs():
+    """Trend/top-state figures and state table (memoized per dataset version)."""
+    # pandas / plotly.express are slow to import; defer to the first render
+    import plotly.express as px
+    from backend.services.h1b_analytics import (
+        get_daily_job_trends,
+        get_top_states_by_jobs,
+        get_top_states_by_h1b,
+        get_state_level_metrics,
+    )
+
+    daily = get_daily_job_trends()
+    top_jobs = get_top_states_by_jobs(15)
+    top_h1b = get_top_states_by_h1b(15)
+    metrics = get_state_level_metrics()
+
+    fig_daily = go.Figure(
+        data=[go.Scatter(x=daily["date"], y=daily["total_postings"], mode="lines+markers", name="Total postings")],
+        layout=go.Layout(
+            title="Daily job postings (last 90 days)",
+            xaxis_title="Date",
+            yaxis_title="Postings",
+            height=350,
+        ),
+    )
+
+    fig_jobs = px.bar(
+        top_jobs, x="state", y="job_count", title="Top states by job count",
+        labels={"state": "State", "job_count": "Jobs"},
+    )
+    fig_h1b = px.bar(
+        top_h1b, x="state", y="petitions", title="Top states by H1B petitions",
+        labels={"state": "State", "petitions": "H1B petitions"},
+    )
+
+    table = dbc.Table.from_dataframe(
+        metrics.head(15)[["state", "job_count", "petitions", "effectiveness_score"]],
+        striped=True,
+        bordered=True,
+        size="sm",
+    )
+    return fig_daily, fig_jobs, fig_h1b, table
+
+
 def register_callbacks(app):
     @app.callback(
         [
@@ -54,34 +92,4 @@ def register_callbacks(app):
         Input("h1b-daily-trend", "id"),  # initial load
     )
     def update_h1b_market(_):
-        daily = get_daily_job_trends()
-        top_jobs = get_top_states_by_jobs(15)
-        top_h1b = get_top_states_by_h1b(15)
-        metrics = get_state_level_metrics()
-
-        fig_daily = go.Figure(
-            data=[go.Scatter(x=daily["date"], y=daily["total_postings"], mode="lines+markers", name="Total postings")],
-            layout=go.Layout(
-                title="Daily job postings (last 90 days)",
-                xaxis_title="Date",
-                yaxis_title="Postings",
-                height=350,
-            ),
-        )
-
-        fig_jobs = px.bar(
-            top_jobs, x="state", y="job_count", title="Top states by job count",
-            labels={"state": "State", "job_count": "Jobs"},
-        )
-        fig_h1b = px.bar(
-            top_h1b, x="state", y="petitions", title="Top states by H1B petitions",
-            labels={"state": "State", "petitions": "H1B petitions"},
-        )
-
-        table = dbc.Table.from_dataframe(
-            metrics.head(15)[["state", "job_count", "petitions", "effectiveness_score"]],
-            striped=True,
-            bordered=True,
-            size="sm",
-        )
-        return fig_daily, fig_jobs, fig_h1b, table
+        return h1b_market_outputs()
@@ -3,16 +3,9 @@ Job application mistakes dashboard: LinkedIn redirects, wrong page, etc.
 """
 import dash_bootstrap_components as dbc
 from dash import dcc, html, Input, Output, callback
-import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
-from backend.services.mistake_analytics import (
-    get_mistakes_by_type_df,
-    get_mistakes_by_source_df,
-    get_mistakes_time_series,
-    get_mistakes_filtered,
-)
 from dashboards.components.filters import mistakes_filters_row
+from backend.metrics import stage
 
 
 def layout():
@@ -55,34 +48,46 @@ def register_callbacks(app):
         Input("mistakes-mistake-type", "value"),
     )
     def update_mistakes(start_date, end_date, source, mistake_type):
+        # pandas / plotly.express are slow to import; defer to the first callback
+        import pandas as pd
+        import plotly.express as px
+        from backend.services.mistake_analytics import get_mistakes_summary
+
         start = pd.to_datetime(start_date) if start_date else None
         end = pd.to_datetime(end_date) if end_date else None
-        source = source or "All"
-        mistake_type = mistake_type or "All"
-        by_type = get_mistakes_by_type_df(start_date=start, end_date=end)
-        by_source = get_mistakes_by_source_df(start_date=start, end_date=end)
-        ts = get_mistakes_time_series(start_date=start, end_date=end, freq="W")
-        raw = get_mistakes_filtered(start_date=start, end_date=end, source=source or "All", mistake_type=mistake_type or "All")
-
-        fig_type = px.bar(
-            by_type, x="mistake_type", y="count", title="Mistakes by type",
-            labels={"mistake_type": "Type", "count": "Count"},
+        summary = get_mistakes_summary(
+            start_date=start,
+            end_date=end,
+            source=source or "All",
+            mistake_type=mistake_type or "All",
+            freq="W",
+            top_n=15,
         )
-        fig_type.update_layout(xaxis_tickangle=-45)
+        by_type = summary["by_type"]
+        by_source = summary["by_source"]
+        ts = summary["time_series"]
+        raw = summary["recent"]
 
-        fig_source = px.pie(
-            by_source, names="source", values="count", title="Mistakes by application source",
-        )
+        with stage("figure"):
+            fig_type = px.bar(
+                by_type, x="mistake_type", y="count", title="Mistakes by type",
+                labels={"mistake_type": "Type", "count": "Count"},
+            )
+            fig_type.update_layout(xaxis_tickangle=-45)
 
-        fig_ts = go.Figure(
-            data=[go.Scatter(x=ts["date"], y=ts["count"], mode="lines+markers", name="Mistakes")],
-            layout=go.Layout(title="Mistakes over time (weekly)", xaxis_title="Date", yaxis_title="Count", height=350),
-        )
+            fig_source = px.pie(
+                by_source, names="source", values="count", title="Mistakes by application source",
+            )
 
-        table = dbc.Table.from_dataframe(
-            raw.head(15)[["date", "company", "job_title", "source", "mistake_type"]].round(0),
-            striped=True,
-            bordered=True,
-            size="sm",
-        )
+            fig_ts = go.Figure(
+                data=[go.Scatter(x=ts["date"], y=ts["count"], mode="lines+markers", name="Mistakes")],
+                layout=go.Layout(title="Mistakes over time (weekly)", xaxis_title="Date", yaxis_title="Count", height=350),
+            )
+
+            table = dbc.Table.from_dataframe(
+                raw.head(15)[["date", "company", "job_title", "source", "mistake_type"]].round(0),
+                striped=True,
+                bordered=True,
+                size="sm",
+            )
         return fig_type, fig_source, fig_ts, table
@@ -1,11 +1,15 @@
 """
 USA heat map page: most effective regions; hover = state name; click = state detail.
+
+The page ships the per-state metrics of every filter combination to the browser
+once (map-metrics-store); filter changes then update the heatmap's z/hovertext
+clientside, without a server round trip.
 """
 import dash_bootstrap_components as dbc
 from dash import dcc, html, Input, Output, State, callback
 import plotly.graph_objects as go
-from backend.services.h1b_analytics import get_state_level_metrics
 from dashboards.components.filters import map_filters_row
+from dashboards.figure_cache import cached_figures
 
 
 def layout():
@@ -18,7 +22,8 @@ def layout():
                 className="text-muted mb-3",
             ),
             map_filters_row(id_prefix="map"),
-            dcc.Graph(id="usa-heatmap", config={"displayModeBar": True}),
+            dcc.Graph(id="usa-heatmap", figure=heatmap_figure("All", "All", "All"), config={"displayModeBar": True}),
+            dcc.Store(id="map-metrics-store", data=heatmap_table()),
             dcc.Store(id="map-click-store", data=None),
             dcc.Link(id="state-detail-link", href="/state/CA", style={"display": "none"}),
         ],
@@ -27,49 +32,104 @@ def layout():
     )
 
 
+@cached_figures("usa-heatmap")
+def heatmap_figure(job_type: str, company_type: str, industry: str):
+    """Choropleth of effectiveness by state for one filter combination (memoized per dataset version)."""
+    from backend.services.h1b_analytics import get_state_level_metrics  # pulls in pandas; defer to first use
+
+    df = get_state_level_metrics(job_type=job_type, company_type=company_type, industry=industry)
+    fig = go.Figure(
+        data=go.Choropleth(
+            locations=df["state"],
+            z=df["effectiveness_score"],
+            locationmode="USA-states",
+            colorscale="Reds",
+            colorbar=dict(title="Effectiveness"),
+            hoverinfo="text",
+            hovertext=[
+                f"<b>{s}</b><br>Jobs: {j:,}<br>H1B petitions: {p:,}<br>Score: {e:,}"
+                for s, j, p, e in zip(
+                    df["state"],
+                    df["job_count"],
+                    df["petitions"],
+                    df["effectiveness_score"],
+                )
+            ],
+        ),
+        layout=go.Layout(
+            title="Job Effectiveness by State (hover for name, click for detail)",
+            geo=dict(
+                scope="usa",
+                showlakes=True,
+                lakecolor="rgb(255,255,255)",
+            ),
+            margin=dict(l=0, r=0, t=40, b=0),
+            height=550,
+        ),
+    )
+    fig.update_traces(
+        hoverlabel=dict(bgcolor="white", font_size=14, font_family="sans-serif")
+    )
+    return fig
+
+
+def _ints(values) -> list:
+    return [None if v != v else int(v) for v in values]  # NaN (state missing from a segment) -> null
+
+
+@cached_figures("usa-heatmap-table")
+def heatmap_table():
+    """
+    Compact per-state table of every filter combination, for the clientside filter:
+    {"version", "states", "petitions", "metrics": {"job|company|industry": [job counts, scores]}},
+    lists aligned with "states". Petitions are the same for every filter (H1B is not segmented).
+    """
+    from backend.data_loader import dataset_version
+    from backend.services.h1b_analytics import get_state_metrics_cube
+
+    cube = get_state_metrics_cube()
+    states = sorted(cube["state"].unique())
+    petitions = cube.groupby("state")["petitions"].first().reindex(states)
+    # One row per filter combination, one column per state
+    wide = cube.set_index("state", append=True)[["job_count", "effectiveness_score"]].unstack("state")
+    jobs = wide["job_count"].reindex(columns=states)
+    scores = wide["effectiveness_score"].reindex(columns=states)
+    metrics = {
+        "|".join(key): [_ints(j), _ints(z)]
+        for key, j, z in zip(wide.index, jobs.to_numpy(), scores.to_numpy())
+    }
+    return {"version": dataset_version(), "states": states, "petitions": _ints(petitions), "metrics": metrics}
+
+
 def register_callbacks(app):
-    @app.callback(
+    # Same hover text as heatmap_figure; the layout and styling of the figure are reused as is
+    app.clientside_callback(
+        """
+        function(jobType, companyType, industry, table, figure) {
+            if (!table || !figure || !figure.data || !figure.data.length) {
+                return window.dash_clientside.no_update;
+            }
+            var key = [jobType || 'All', companyType || 'All', industry || 'All'].join('|');
+            var m = table.metrics[key] || [[], []];
+            var fmt = function(n) { return n === null || n === undefined ? '0' : n.toLocaleString('en-US'); };
+            var locations = [], z = [], text = [];
+            table.states.forEach(function(s, i) {
+                var jobs = m[0][i], score = m[1][i];
+                if (jobs === null || jobs === undefined) { return; }
+                locations.push(s);
+                z.push(score);
+                text.push('<b>' + s + '</b><br>Jobs: ' + fmt(jobs) + '<br>H1B petitions: ' +
+                          fmt(table.petitions[i]) + '<br>Score: ' + fmt(score));
+            });
+            var trace = Object.assign({}, figure.data[0], {locations: locations, z: z, hovertext: text});
+            return Object.assign({}, figure, {data: [trace].concat(figure.data.slice(1))});
+        }
+        """,
         Output("usa-heatmap", "figure"),
         Input("map-job-type", "value"),
         Input("map-company-type", "value"),
         Input("map-industry", "value"),
+        State("map-metrics-store", "data"),
+        State("usa-heatmap", "figure"),
+        prevent_initial_call=True,
     )
-    def update_heatmap(job_type, company_type, industry):
-        df = get_state_level_metrics(
-            job_type=job_type or "All",
-            company_type=company_type or "All",
-            industry=industry or "All",
-        )
-        fig = go.Figure(
-            data=go.Choropleth(
-                locations=df["state"],
-                z=df["effectiveness_score"],
-                locationmode="USA-states",
-                colorscale="Reds",
-                colorbar=dict(title="Effectiveness"),
-                hoverinfo="text",
-                hovertext=[
-                    f"<b>{s}</b><br>Jobs: {j:,}<br>H1B petitions: {p:,}<br>Score: {e:,}"
-                    for s, j, p, e in zip(
-                        df["state"],
-                        df["job_count"],
-                        df["petitions"],
-                        df["effectiveness_score"],
-                    )
-                ],
-            ),
-            layout=go.Layout(
-                title="Job Effectiveness by State (hover for name, click for detail)",
-                geo=dict(
-                    scope="usa",
-                    showlakes=True,
-                    lakecolor="rgb(255,255,255)",
-                ),
-                margin=dict(l=0, r=0, t=40, b=0),
-                height=550,
-            ),
-        )
-        fig.update_traces(
-            hoverlabel=dict(bgcolor="white", font_size=14, font_family="sans-serif")
-        )
-        return fig
@@ -3,8 +3,6 @@ State detail page: same heat map style for one state (zoomed); filters apply.
 """
 import dash_bootstrap_components as dbc
 from dash import dcc, html, Input, Output, callback
-import plotly.graph_objects as go
-from backend.services.h1b_analytics import get_state_detail, get_state_level_metrics
 from dashboards.components.filters import map_filters_row
 
 
@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for production serving: gunicorn -c gunicorn.conf.py wsgi:server
+Override with environment variables (WEB_CONCURRENCY, GUNICORN_THREADS, PORT, ...).
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+# Several processes so one CPU-bound callback (e.g. pdfplumber) cannot stall every user
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Threads per worker absorb I/O waits; CPU-bound work is spread over processes
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+# Import the app (and preload datasets) once in the master before forking
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers periodically to bound memory growth from per-worker caches
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = 200
+accesslog = "-"
+errorlog = "-"
@@ -0,0 +1,168 @@
+"""
+Bulk resume scoring: extract + analyze a whole cohort of resumes against one or
+more job descriptions, fanned out across a process pool. PDF extraction honours
+the RESUME_PDF_* page/char/time limits.
+
+Results stream to the output file (JSONL) as files finish, one row per
+(resume, job description), with per-file timings and errors. A .parquet output
+path collects the rows and writes them once at the end.
+
+    python jobs/bulk_resume_scoring.py resumes/ --jd backend_eng.txt --jd data_analyst.txt -o scores.jsonl
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Add project root to path
+import sys
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.services.resume_analyzer import PdfExtractionReport, extract_resume_text, analyze_resume
+
+RESUME_SUFFIXES = (".pdf", ".docx", ".doc", ".txt")
+
+
+def find_resumes(root: Path) -> List[Path]:
+    """All resume files under root (or root itself if it is a file), sorted."""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in RESUME_SUFFIXES)
+
+
+def _score_file(path: str, job_descriptions: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Worker: extract one resume and analyze it against every job description."""
+    base = {"file": path, "extract_seconds": None, "error": None}
+    report = PdfExtractionReport()
+    t0 = time.perf_counter()
+    try:
+        text = extract_resume_text(Path(path), report)
+    except Exception as e:
+        return [{**base, "jd_id": None, "extract_seconds": time.perf_counter() - t0, "error": repr(e)}]
+    base["extract_seconds"] = time.perf_counter() - t0
+    # PDF only: seconds per page read, and the limit that cut extraction short (if any)
+    base["page_seconds"] = report.page_seconds
+    base["extract_stopped"] = report.stopped
+    if not text.strip():
+        return [{**base, "jd_id": None, "error": "No text extracted"}]
+
+    rows = []
+    for jd_id, jd in job_descriptions.items():
+        t1 = time.perf_counter()
+        try:
+            result = analyze_resume(text, jd)
+        except Exception as e:
+            rows.append({**base, "jd_id": jd_id, "analyze_seconds": time.perf_counter() - t1, "error": repr(e)})
+            continue
+        rows.append({
+            **base,
+            "jd_id": jd_id,
+            "analyze_seconds": time.perf_counter() - t1,
+            "ats_score": result["ats_score"],
+            "f1_score": result["f1_score"],
+            "word_count": result["word_count"],
+            "keywords_found": result["keywords_found"],
+            "keywords_missing": result["keywords_missing"],
+            "suggestions": result["suggestions"],
+        })
+    return rows
+
+
+def iter_bulk_scores(
+    paths: Iterable[Path],
+    job_descriptions: Dict[str, str],
+    max_workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield result rows as resumes finish, in completion order.
+    At most a few tasks per worker are in flight, so memory stays bounded for large cohorts.
+    """
+    job_descriptions = job_descriptions or {"none": ""}
+    max_workers = max_workers or os.cpu_count() or 1
+    pending = iter(str(p) for p in paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        in_flight = set()
+        for path in pending:
+            in_flight.add(pool.submit(_score_file, path, job_descriptions))
+            if len(in_flight) >= max_workers * 4:
+                break
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield from fut.result()
+                path = next(pending, None)
+                if path is not None:
+                    in_flight.add(pool.submit(_score_file, path, job_descriptions))
+
+
+def score_resumes(
+    paths: Iterable[Path],
+    job_descriptions: Dict[str, str],
+    output_path: Path,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Score resumes in parallel and write one results file (.jsonl or .parquet); return run stats."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    rows = errors = 0
+    files = set()
+    # JSONL is written as rows arrive; parquet is written once at the end
+    stream = None if output_path.suffix == ".parquet" else open(output_path, "w", encoding="utf-8")
+    collected = []
+    try:
+        for row in iter_bulk_scores(paths, job_descriptions, max_workers=max_workers):
+            rows += 1
+            files.add(row["file"])
+            errors += row["error"] is not None
+            if stream is None:
+                collected.append(row)
+            else:
+                stream.write(json.dumps(row) + "\n")
+    finally:
+        if stream is not None:
+            stream.close()
+    if stream is None:
+        import pandas as pd
+        pd.DataFrame(collected).to_parquet(output_path, index=False)
+    elapsed = time.perf_counter() - t0
+    return {
+        "files": len(files),
+        "rows": rows,
+        "errors": errors,
+        "seconds": elapsed,
+        "files_per_second": len(files) / elapsed if elapsed else 0.0,
+        "output": str(output_path),
+    }
+
+
+def _load_job_descriptions(paths: List[str]) -> Dict[str, str]:
+    return {Path(p).stem: Path(p).read_text(encoding="utf-8", errors="ignore") for p in paths}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Score a cohort of resumes against job descriptions.")
+    parser.add_argument("resumes", help="Resume file or directory (PDF/DOCX/TXT, searched recursively)")
+    parser.add_argument("--jd", action="append", default=[], help="Job description text file (repeatable)")
+    parser.add_argument("-o", "--output", default="resume_scores.jsonl", help="Results file (.jsonl or .parquet)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    paths = find_resumes(Path(args.resumes))
+    stats = score_resumes(paths, _load_job_descriptions(args.jd), Path(args.output), max_workers=args.workers)
+    print(
+        f"[{datetime.now().isoformat()}] Scored {stats['files']} resumes ({stats['rows']} rows, "
+        f"{stats['errors']} errors) in {stats['seconds']:.1f}s ({stats['files_per_second']:.1f} files/s) "
+        f"-> {stats['output']}"
+    )
+    return stats
+
+
+if __name__ == "__main__":
+    main()
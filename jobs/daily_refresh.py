@@ -1,9 +1,16 @@
 """
 Daily data refresh pipeline: writes processed H1B and job-postings data.
 In production, replace synthetic generation with real API/scrape calls.
+
+Each run writes a complete snapshot directory (outputs of skipped steps are
+carried over from the current one) and publishes it with one atomic manifest swap.
 """
+import argparse
+import os
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+from pyarrow import feather
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -14,56 +21,268 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from config.settings import (
     PROCESSED_DIR,
+    RAW_DIR,
+    RAW_POSTINGS_PATTERN,
+    RAW_H1B_PATTERN,
+    REFRESH_STATE_FILE,
+    WRITE_ARROW_MIRRORS,
+    ARROW_SUFFIX,
+    ensure_data_dirs,
     USA_STATES,
     H1B_STATE_AGGREGATE,
+    H1B_EMPLOYER_AGGREGATE,
     JOB_POSTINGS_DAILY,
     JOB_POSTINGS_BY_STATE,
+    JOB_POSTINGS_BY_SEGMENT,
+    STATE_METRICS_CUBE,
     MISTAKES_AGGREGATE,
-    MISTAKES_BY_TYPE,
+    MISTAKES_DAILY_ROLLUP,
 )
 from backend.data_loader import (
     _synthetic_h1b_by_state,
+    _synthetic_h1b_by_employer,
     _synthetic_job_postings_by_state,
+    _synthetic_job_postings_by_segment,
     _synthetic_job_postings_daily,
     _synthetic_mistakes,
+    _build_state_metrics_cube,
+    _build_mistakes_daily_rollup,
+    partition_dir,
+    categorize,
+    concat_frames,
+    MISTAKES_CATEGORICAL,
+    SEGMENT_CATEGORICAL,
 )
+from backend.snapshots import carry_over, current_dir, discard, new_snapshot_dir, publish, resolve
+from jobs.pipeline import Step, run_pipeline, format_report
+from jobs.h1b_disclosures import find_h1b_disclosures, ingest_h1b_disclosures
+from jobs.raw_postings import find_raw_postings, ingest_raw_postings
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, index: bool = False) -> None:
+    """
+    Write via temp file + rename; never truncates a file shared (hard-linked) with another snapshot.
+    Unless disabled, an uncompressed Arrow IPC mirror is written next to it for memory-mapped loads.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    df.to_parquet(tmp, index=index)
+    mirror = path.with_suffix(ARROW_SUFFIX)
+    if WRITE_ARROW_MIRRORS:
+        mirror_tmp = mirror.with_name(f".{mirror.name}.tmp")
+        table = pa.Table.from_pandas(df, preserve_index=index)
+        # One record batch, so each column maps to one contiguous buffer (zero-copy to pandas)
+        feather.write_feather(table, mirror_tmp, compression="uncompressed", chunksize=max(len(table), 1))
+        os.replace(mirror_tmp, mirror)
+    else:
+        # A mirror carried over from an earlier snapshot would shadow the new parquet file
+        mirror.unlink(missing_ok=True)
+    os.replace(tmp, path)
 
 
-def refresh_h1b_by_state():
-    """Fetch/refresh H1B by state. Here we (re)generate synthetic; replace with USCIS fetch."""
-    df = _synthetic_h1b_by_state()
-    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(H1B_STATE_AGGREGATE, index=False)
+def _upsert_partitions(
+    df: pd.DataFrame,
+    dataset: Path,
+    part_name: str,
+    replace_months: bool = False,
+) -> pd.DataFrame:
+    """
+    Upsert rows into a year=/month= partitioned dataset by calendar day: stored rows
+    on any day present in df are replaced by df's rows for that day, so late rows and
+    re-runs on the same day correct the history instead of duplicating it.
+    Only the month partitions df touches are rewritten, each as a single part file;
+    with replace_months, their stored rows are dropped entirely (df is the full source for those months).
+    A legacy single-file dataset at the same path is converted first. Returns df sorted by date.
+    """
+    if dataset.is_file():
+        legacy = pd.read_parquet(dataset)
+        dataset.unlink()
+        _upsert_partitions(legacy, dataset, f"{part_name}-legacy")
+    df = df.sort_values("date", kind="stable", ignore_index=True)
+    for (year, month), part in df.groupby([df["date"].dt.year, df["date"].dt.month]):
+        target = partition_dir(dataset, pd.Timestamp(year=year, month=month, day=1))
+        stored_files = sorted(target.glob("*.parquet"))
+        if stored_files and not replace_months:
+            stored = concat_frames([pd.read_parquet(f) for f in stored_files])
+            stored = stored[~stored["date"].dt.normalize().isin(part["date"].dt.normalize().unique())]
+            part = concat_frames([stored, part]).sort_values("date", kind="stable", ignore_index=True)
+        path = target / f"part-{part_name}.parquet"
+        _write_parquet(part, path)
+        for f in stored_files:
+            if f != path:
+                f.unlink()
+                f.with_suffix(ARROW_SUFFIX).unlink(missing_ok=True)
     return df
 
 
-def refresh_job_postings():
-    """Refresh daily job postings and by-state aggregates. Replace with job-board API."""
-    daily = _synthetic_job_postings_daily()
-    by_state = _synthetic_job_postings_by_state()
-    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    daily.to_parquet(JOB_POSTINGS_DAILY, index=False)
-    by_state.to_parquet(JOB_POSTINGS_BY_STATE, index=False)
-    return daily, by_state
+def refresh_h1b(out_dir: Path = PROCESSED_DIR):
+    """
+    Refresh the H1B by-state and by-employer aggregates from the disclosure files in
+    RAW_DIR (one streaming pass across processes, see jobs/h1b_disclosures.py);
+    synthetic if there are none.
+    """
+    raw_files = find_h1b_disclosures()
+    if raw_files:
+        agg, seconds = ingest_h1b_disclosures(raw_files)
+        print(
+            f"[{datetime.now().isoformat()}] h1b: aggregated {agg.rows:,} disclosure rows from "
+            f"{len(raw_files)} file(s) in {seconds:.1f}s ({agg.rows / seconds if seconds else 0:,.0f} rows/s)"
+        )
+        by_state, by_employer = agg.state_frame(), agg.employer_frame()
+    else:
+        by_state, by_employer = _synthetic_h1b_by_state(), _synthetic_h1b_by_employer()
+    _write_parquet(by_state, out_dir / H1B_STATE_AGGREGATE.name)
+    _write_parquet(by_employer, out_dir / H1B_EMPLOYER_AGGREGATE.name)
+    return by_state, by_employer
 
 
-def refresh_mistakes():
-    """Refresh job application mistakes. In production, load from DB or user submissions."""
-    df = _synthetic_mistakes()
-    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(MISTAKES_AGGREGATE, index=False)
-    by_type = df.groupby("mistake_type", as_index=False).agg(count=("id", "count"))
-    by_type.to_parquet(MISTAKES_BY_TYPE, index=False)
-    return df
+def refresh_job_postings(out_dir: Path = PROCESSED_DIR):
+    """
+    Refresh daily job postings and by-state aggregates from the raw exports in
+    RAW_DIR (streamed in chunks, see jobs/raw_postings.py); synthetic if there are none.
+    The daily series is upserted by day into the stored history; months covered by
+    the raw exports are replaced outright, so they never mix with earlier synthetic days.
+    """
+    raw_files = find_raw_postings()
+    if raw_files:
+        agg = ingest_raw_postings(raw_files)
+        print(f"[{datetime.now().isoformat()}] job_postings: ingested {agg.report()}")
+        daily, by_state, by_segment = agg.daily_frame(), agg.by_state_frame(), agg.by_segment_frame()
+    else:
+        daily = _synthetic_job_postings_daily()
+        by_state = _synthetic_job_postings_by_state()
+        by_segment = _synthetic_job_postings_by_segment()
+    by_segment = categorize(by_segment, SEGMENT_CATEGORICAL)
+    daily = daily.assign(date=daily["date"].dt.normalize())
+    daily = _upsert_partitions(
+        daily, out_dir / JOB_POSTINGS_DAILY.name, out_dir.name, replace_months=bool(raw_files)
+    )
+    _write_parquet(by_state, out_dir / JOB_POSTINGS_BY_STATE.name)
+    _write_parquet(by_segment, out_dir / JOB_POSTINGS_BY_SEGMENT.name)
+    return daily, by_state, by_segment
+
+
+def refresh_state_metrics_cube(
+    out_dir: Path = PROCESSED_DIR,
+    h1b: pd.DataFrame = None,
+    by_segment: pd.DataFrame = None,
+):
+    """
+    Materialize per-state metrics for every job type x company type x industry filter.
+    Inputs default to the files in out_dir, so this can run after upstream steps were skipped.
+    """
+    if h1b is None:
+        h1b = pd.read_parquet(out_dir / H1B_STATE_AGGREGATE.name)
+    if by_segment is None:
+        by_segment = pd.read_parquet(out_dir / JOB_POSTINGS_BY_SEGMENT.name)
+    cube = _build_state_metrics_cube(h1b, by_segment)
+    _write_parquet(cube, out_dir / STATE_METRICS_CUBE.name, index=True)
+    return cube
+
+
+def refresh_mistakes(out_dir: Path = PROCESSED_DIR):
+    """
+    Refresh job application mistakes. In production, load from DB or user submissions.
+    Mistakes are upserted by day into the partitions, and the daily rollup rows of
+    those days are replaced to match. String columns are written dictionary-encoded (categorical).
+    """
+    mistakes = categorize(_synthetic_mistakes(), MISTAKES_CATEGORICAL)
+    df = _upsert_partitions(mistakes, out_dir / MISTAKES_AGGREGATE.name, out_dir.name)
+    rollup_path = out_dir / MISTAKES_DAILY_ROLLUP.name
+    rollup = _build_mistakes_daily_rollup(df)
+    if rollup_path.exists():
+        stored = pd.read_parquet(rollup_path)
+        stored = stored[~stored["date"].isin(rollup["date"].unique())]
+        rollup = concat_frames([stored, rollup]).sort_values("date", kind="stable", ignore_index=True)
+    _write_parquet(rollup, rollup_path)
+    return df, rollup
+
+
+def _raw_sources_fingerprint(pattern: str) -> str:
+    """Names, sizes and mtimes of raw source files matching pattern under RAW_DIR."""
+    files = sorted(RAW_DIR.glob(pattern)) if RAW_DIR.exists() else []
+    return ";".join(f"{p.name}:{p.stat().st_size}:{p.stat().st_mtime_ns}" for p in files if p.is_file())
+
+
+def _quarterly_fingerprint() -> str:
+    """H1B sources (USCIS/DOL) publish quarterly; refresh once per quarter or when raw files change."""
+    now = datetime.now()
+    return f"{now.year}Q{(now.month - 1) // 3 + 1}|{_raw_sources_fingerprint(RAW_H1B_PATTERN)}"
+
+
+def _daily_fingerprint() -> str:
+    return datetime.now().date().isoformat()
+
+
+def refresh_steps(out_dir: Path):
+    """The refresh DAG, writing into out_dir."""
+    def out(*paths):
+        return tuple(out_dir / p.name for p in paths)
+
+    return [
+        Step(
+            "h1b",
+            lambda: refresh_h1b(out_dir),
+            fingerprint=_quarterly_fingerprint,
+            outputs=out(H1B_STATE_AGGREGATE, H1B_EMPLOYER_AGGREGATE),
+        ),
+        Step(
+            "job_postings",
+            lambda: refresh_job_postings(out_dir),
+            fingerprint=lambda: f"{_daily_fingerprint()}|{_raw_sources_fingerprint(RAW_POSTINGS_PATTERN)}",
+            outputs=out(JOB_POSTINGS_DAILY, JOB_POSTINGS_BY_STATE, JOB_POSTINGS_BY_SEGMENT),
+        ),
+        Step(
+            "state_metrics_cube",
+            lambda: refresh_state_metrics_cube(out_dir),
+            deps=("h1b", "job_postings"),
+            fingerprint=lambda: "state_metrics_cube",
+            outputs=out(STATE_METRICS_CUBE),
+        ),
+        Step(
+            "mistakes",
+            lambda: refresh_mistakes(out_dir),
+            fingerprint=_daily_fingerprint,
+            outputs=out(MISTAKES_AGGREGATE, MISTAKES_DAILY_ROLLUP),
+        ),
+    ]
 
 
-def run_full_refresh():
-    """Run all refresh steps (call from cron/APScheduler daily)."""
-    refresh_h1b_by_state()
-    refresh_job_postings()
-    refresh_mistakes()
-    print(f"[{datetime.now().isoformat()}] Daily refresh completed.")
+def run_full_refresh(force: bool = False, max_workers: int = 4):
+    """
+    Run all refresh steps (call from cron/APScheduler daily).
+    Independent steps run concurrently; steps whose inputs are unchanged since the last run are skipped.
+    The new snapshot is published only if every step succeeded.
+    """
+    t0 = datetime.now()
+    ensure_data_dirs()
+    staging = new_snapshot_dir()
+    steps = refresh_steps(staging)
+    outputs = [o for step in steps for o in step.outputs]
+    carry_over(current_dir(), staging, names=[n for o in outputs for n in (o.name, o.with_suffix(ARROW_SUFFIX).name)])
+    results = run_pipeline(
+        steps,
+        staging / REFRESH_STATE_FILE.name,
+        max_workers=max_workers,
+        force=force,
+        previous_state_path=resolve(REFRESH_STATE_FILE),
+    )
+    failed = [r.name for r in results.values() if r.status in ("failed", "blocked")]
+    if failed:
+        discard(staging)
+        status = f"failed ({', '.join(failed)}); snapshot not published"
+    else:
+        publish(staging)
+        status = f"completed; published snapshot {staging.name}"
+    elapsed = (datetime.now() - t0).total_seconds()
+    print(f"[{datetime.now().isoformat()}] Daily refresh {status} in {elapsed:.2f}s.")
+    print(format_report(results))
+    return results
 
 
 if __name__ == "__main__":
-    run_full_refresh()
+    parser = argparse.ArgumentParser(description="Refresh processed dashboard data.")
+    parser.add_argument("--force", action="store_true", help="Re-run every step even if its inputs are unchanged")
+    parser.add_argument("--workers", type=int, default=4, help="Max steps to run concurrently")
+    args = parser.parse_args()
+    run_full_refresh(force=args.force, max_workers=args.workers)
@@ -0,0 +1,412 @@
+"""
+Streaming ingestion of H-1B disclosure files (DOL LCA disclosure data exported to
+CSV, optionally .gz) from RAW_DIR into the state and employer aggregates.
+
+Only the needed columns are parsed (pyarrow CSV with include_columns and
+dictionary-typed low-cardinality columns), in RAW_BLOCK_BYTES blocks.
+
+Parsing is spread over processes. Each uncompressed CSV is split into
+newline-aligned byte ranges, one task per range. Compressed files, and files
+whose quoted values contain line breaks, are streamed by a single task.
+
+Every task folds its rows into mergeable partial counts, keyed by the fiscal
+year of the decision date:
+- petitions per worksite state;
+- petitions, approvals and denials per employer;
+- a per-employer histogram of annualized wages in WAGE_BIN steps, from which
+  the median is read.
+
+Memory therefore depends on the number of employers, not on the number of
+rows. The state and employer aggregates of the newest fiscal year come out of
+this one pass; a warning names any other years that were left out.
+
+    python jobs/h1b_disclosures.py data/raw/h1b_lca_fy2024_q*.csv --workers 8
+"""
+import argparse
+import csv
+import gzip
+import io
+import multiprocessing
+import os
+import re
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+import sys
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import RAW_DIR, RAW_H1B_PATTERN, RAW_BLOCK_BYTES, USA_STATES
+from jobs.normalize import normalize_column, normalize_state
+
+RAW_SUFFIXES = (".csv", ".csv.gz")
+# Source column names accepted for each field, first match wins (case-insensitive)
+FIELD_ALIASES = {
+    "case_status": ("case_status", "status"),
+    "visa_class": ("visa_class", "visa_type"),
+    "employer": ("employer_name", "employer_business_name", "employer"),
+    "state": ("worksite_state", "worksite_state_1", "employer_state"),
+    "wage": ("wage_rate_of_pay_from", "wage_rate_of_pay_from_1", "wage_rate_of_pay", "prevailing_wage"),
+    "wage_unit": ("wage_unit_of_pay", "wage_unit_of_pay_1", "pw_unit_of_pay"),
+    "decision_date": ("decision_date", "case_submitted", "received_date"),
+}
+REQUIRED_FIELDS = ("case_status", "employer", "state")
+EMPLOYER_COLUMNS = ["employer", "petitions", "approvals", "denials", "approval_rate", "median_wage", "fy"]
+# Low-cardinality columns are parsed straight into dictionary arrays (pandas categoricals)
+_DICTIONARY_FIELDS = ("case_status", "visa_class", "state", "wage_unit", "decision_date")
+
+WAGE_BIN = 1_000  # median_wage resolution (annual USD)
+WAGE_RANGE = (10_000, 2_000_000)  # annualized wages outside this are data-entry errors
+_WAGE_UNITS = {"year": 1, "month": 12, "bi-weekly": 26, "biweekly": 26, "week": 52, "hour": 2080}
+_ENTITY_SUFFIX_RE = re.compile(r"(,?\s+(INC|LLC|L L C|CORP|CORPORATION|CO|COMPANY|LTD|LLP|LP|PC|PLLC|NA))+$")
+_NON_NAME_RE = re.compile(r"[^A-Z0-9&\s]")
+
+
+def find_h1b_disclosures(raw_dir: Path = RAW_DIR, pattern: str = RAW_H1B_PATTERN) -> List[Path]:
+    """H-1B disclosure files under raw_dir, sorted by name."""
+    if not raw_dir.exists():
+        return []
+    return sorted(p for p in raw_dir.glob(pattern) if p.is_file() and p.name.lower().endswith(RAW_SUFFIXES))
+
+
+def normalize_employer(value) -> Optional[str]:
+    """Upper-case employer name without punctuation or trailing entity suffixes ("Acme, Inc." -> "ACME")."""
+    if not isinstance(value, str):
+        return None
+    name = " ".join(_NON_NAME_RE.sub(" ", value.upper().replace(".", "")).split())
+    name = _ENTITY_SUFFIX_RE.sub("", name).strip()
+    return name or None
+
+
+def _status(value) -> str:
+    v = value.lower() if isinstance(value, str) else ""
+    if "certified" in v or "approved" in v:
+        return "approved"
+    return "denied" if "denied" in v else "other"
+
+
+def _wage_factor(value) -> float:
+    v = value.strip().lower() if isinstance(value, str) else ""
+    return float(_WAGE_UNITS.get(v, 1 if not v else np.nan))
+
+
+def _is_h1b(value) -> bool:
+    return isinstance(value, str) and "H-1B" in value.upper()
+
+
+def _fiscal_year(value) -> Optional[int]:
+    """US federal fiscal year of a date string (FY2025 starts 2024-10-01)."""
+    ts = pd.to_datetime(value, errors="coerce") if isinstance(value, str) else pd.NaT
+    return None if pd.isna(ts) else ts.year + (ts.month >= 10)
+
+
+# Partial aggregates
+
+@dataclass
+class H1BAggregates:
+    """
+    Mergeable counts over the rows seen so far (one per task; merged in the parent),
+    keyed by fiscal year so files from different years are never summed together.
+    Rows without a usable decision date fall under fiscal year 0.
+    """
+    by_state: Optional[pd.Series] = None  # (fy, state) -> petitions
+    by_employer: Optional[pd.DataFrame] = None  # (fy, employer) -> petitions, approvals, denials
+    wage_bins: Optional[pd.Series] = None  # (fy, employer, wage bin) -> rows
+    rows: int = 0
+
+    def add(self, df: pd.DataFrame) -> None:
+        """Fold one block of canonical-field rows (see FIELD_ALIASES) into the counts."""
+        self.rows += len(df)
+        if "visa_class" in df.columns:
+            df = df[normalize_column(df["visa_class"], _is_h1b).astype(bool)]
+        if df.empty:
+            return
+        if "decision_date" in df.columns:
+            fy = normalize_column(df["decision_date"], _fiscal_year).fillna(0).astype("int64")
+        else:
+            fy = pd.Series(0, index=df.index, dtype="int64")
+        status = normalize_column(df["case_status"], _status)
+        employer = normalize_column(df["employer"], normalize_employer)
+        states = normalize_column(df["state"], normalize_state)
+        self.by_state = _add(self.by_state, pd.DataFrame({"fy": fy, "state": states}).value_counts())
+
+        known = employer.notna()
+        counts = pd.DataFrame({
+            "fy": fy[known],
+            "employer": employer[known],
+            "approvals": (status[known] == "approved").astype("int64"),
+            "denials": (status[known] == "denied").astype("int64"),
+        }).groupby(["fy", "employer"]).agg(
+            petitions=("approvals", "size"), approvals=("approvals", "sum"), denials=("denials", "sum")
+        )
+        self.by_employer = _add(self.by_employer, counts)
+
+        if "wage" in df.columns:
+            wage = pd.to_numeric(df["wage"].str.replace(r"[$,\s]", "", regex=True), errors="coerce")
+            if "wage_unit" in df.columns:
+                wage = wage * normalize_column(df["wage_unit"], _wage_factor).astype(float)
+            valid = known & wage.between(*WAGE_RANGE)
+            bins = pd.DataFrame({
+                "fy": fy[valid],
+                "employer": employer[valid],
+                "bin": (wage[valid] / WAGE_BIN).round().astype("int64"),
+            })
+            self.wage_bins = _add(self.wage_bins, bins.value_counts(["fy", "employer", "bin"]))
+
+    def merge(self, other: "H1BAggregates") -> None:
+        self.by_state = _add(self.by_state, other.by_state)
+        self.by_employer = _add(self.by_employer, other.by_employer)
+        self.wage_bins = _add(self.wage_bins, other.wage_bins)
+        self.rows += other.rows
+
+    @property
+    def fiscal_years(self) -> List[int]:
+        """Fiscal years with H-1B petitions, oldest first (0: rows without a usable decision date)."""
+        if self.by_state is None:
+            return []
+        return sorted(int(y) for y in self.by_state.index.unique(level="fy"))
+
+    @property
+    def fy(self) -> Optional[int]:
+        """The fiscal year the frames report: the newest one seen (None if no row had a decision date)."""
+        years = [y for y in self.fiscal_years if y]
+        return years[-1] if years else None
+
+    def _petitions_outside_fy(self) -> int:
+        if self.by_state is None:
+            return 0
+        years = self.by_state.index.get_level_values("fy")
+        return int(self.by_state[years != (self.fy or 0)].sum())
+
+    def state_frame(self) -> pd.DataFrame:
+        """h1b_by_state rows (state, petitions, fy) of fiscal year fy, for every state (0 when absent)."""
+        by_state = _for_year(self.by_state, self.fy or 0)
+        if by_state is None:
+            by_state = pd.Series(dtype="int64")
+        petitions = by_state.reindex(USA_STATES, fill_value=0).astype("int64")
+        return pd.DataFrame({"state": USA_STATES, "petitions": petitions.to_numpy(), "fy": self.fy or 0})
+
+    def employer_frame(self) -> pd.DataFrame:
+        """h1b_by_employer rows of fiscal year fy: employer, petitions, approvals, denials, approval_rate, median_wage, fy."""
+        by_employer = _for_year(self.by_employer, self.fy or 0)
+        if by_employer is None or by_employer.empty:
+            return pd.DataFrame(columns=EMPLOYER_COLUMNS)
+        out = by_employer.astype("int64")
+        decided = out["approvals"] + out["denials"]
+        out["approval_rate"] = (out["approvals"] / decided.where(decided > 0)).round(4)
+        out["median_wage"] = _binned_median(_for_year(self.wage_bins, self.fy or 0)).reindex(out.index)
+        out["fy"] = self.fy or 0
+        out = out.rename_axis("employer").reset_index()[EMPLOYER_COLUMNS]
+        return out.sort_values(["petitions", "employer"], ascending=[False, True], ignore_index=True)
+
+
+def _for_year(counts, fy: int):
+    """The rows of a fy-keyed count table for one fiscal year, without the fy level (None if absent)."""
+    if counts is None or fy not in counts.index.get_level_values("fy"):
+        return None
+    return counts.xs(fy, level="fy")
+
+
+def _add(total, counts):
+    """Sum two count tables aligned on their index (None is empty)."""
+    if total is None:
+        return counts
+    if counts is None:
+        return total
+    return total.add(counts, fill_value=0)
+
+
+def _binned_median(wage_bins: Optional[pd.Series]) -> pd.Series:
+    """Per-employer median annual wage from (employer, bin) counts, to the nearest WAGE_BIN."""
+    if wage_bins is None or wage_bins.empty:
+        return pd.Series(dtype="float64")
+    bins = wage_bins.rename("n").reset_index().sort_values(["employer", "bin"], ignore_index=True)
+    grouped = bins.groupby("employer")["n"]
+    reached = grouped.cumsum() >= grouped.transform("sum") / 2
+    return (bins[reached].groupby("employer")["bin"].first() * WAGE_BIN).astype("float64")
+
+
+# Reading
+
+def _header(path: Path) -> Tuple[List[str], int]:
+    """Column names and the byte offset where data rows start."""
+    opener = gzip.open if path.name.lower().endswith(".gz") else open
+    with opener(path, "rb") as f:
+        line = f.readline()
+        offset = f.tell()
+    names = next(csv.reader([line.decode("utf-8-sig")]))
+    return names, offset
+
+
+def _field_columns(names: Iterable[str]) -> Dict[str, str]:
+    by_lower = {n.strip().lower(): n for n in names}
+    found = {}
+    for field_name, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            if alias in by_lower:
+                found[field_name] = by_lower[alias]
+                break
+    missing = [f for f in REQUIRED_FIELDS if f not in found]
+    if missing:
+        raise ValueError(f"missing columns for {missing} (accepted: {[FIELD_ALIASES[f] for f in missing]})")
+    return found
+
+
+def _convert_options(fields: Dict[str, str]):
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    types = {
+        src: pa.dictionary(pa.int32(), pa.string()) if f in _DICTIONARY_FIELDS else pa.string()
+        for f, src in fields.items()
+    }
+    return pa_csv.ConvertOptions(include_columns=list(fields.values()), column_types=types)
+
+
+def _to_fields(table, fields: Dict[str, str]) -> pd.DataFrame:
+    return table.to_pandas().rename(columns={src: f for f, src in fields.items()})
+
+
+def _blocks(path: Path, start: int, end: int, block_bytes: int) -> Iterator[bytes]:
+    """Bytes [start, end) of path in blocks of about block_bytes, each ending on a line break."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            block = f.read(min(block_bytes, end - pos))
+            pos += len(block)
+            if pos < end and not block.endswith(b"\n"):
+                tail = f.readline()
+                block += tail
+                pos += len(tail)
+            yield block
+
+
+def _aggregate_range(path: str, start: int, end: int, block_bytes: int) -> H1BAggregates:
+    """Worker: parse the rows in bytes [start, end) of an uncompressed CSV (no line breaks inside values)."""
+    from pyarrow import csv as pa_csv
+
+    path = Path(path)
+    names, _ = _header(path)
+    fields = _field_columns(names)
+    read_options = pa_csv.ReadOptions(column_names=names, use_threads=False)
+    convert_options = _convert_options(fields)
+    agg = H1BAggregates()
+    for block in _blocks(path, start, end, block_bytes):
+        table = pa_csv.read_csv(io.BytesIO(block), read_options=read_options, convert_options=convert_options)
+        agg.add(_to_fields(table, fields))
+    return agg
+
+
+def _aggregate_stream(path: str, block_bytes: int) -> H1BAggregates:
+    """Worker: parse a whole file sequentially (compressed files, or quoted values spanning lines)."""
+    from pyarrow import csv as pa_csv
+
+    path = Path(path)
+    names, _ = _header(path)
+    fields = _field_columns(names)
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=block_bytes),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=_convert_options(fields),
+    )
+    agg = H1BAggregates()
+    for batch in reader:
+        agg.add(_to_fields(batch, fields))
+    return agg
+
+
+def split_ranges(path: Path, parts: int, block_bytes: int) -> List[Tuple[int, int]]:
+    """Up to parts newline-aligned byte ranges covering the data rows (one range for small files)."""
+    size = path.stat().st_size
+    _, data_start = _header(path)
+    parts = max(1, min(parts, (size - data_start) // max(block_bytes // 4, 1)))
+    bounds = [data_start]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(data_start + (size - data_start) * i // parts)
+            f.readline()
+            bounds.append(f.tell())
+    bounds.append(size)
+    bounds = sorted(set(bounds))
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def ingest_h1b_disclosures(
+    paths: Iterable[Path],
+    max_workers: Optional[int] = None,
+    block_bytes: int = RAW_BLOCK_BYTES,
+) -> Tuple[H1BAggregates, float]:
+    """
+    Aggregate every file across a process pool; return (merged aggregates, seconds).
+    Warns when the files span several fiscal years: the frames report only the newest.
+    """
+    import pyarrow as pa
+
+    paths = [Path(p) for p in paths]
+    max_workers = max_workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    total = H1BAggregates()
+    # spawn: this may run inside the refresh pipeline's threads, where fork is unsafe
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        ranged = {}
+        streamed = []
+        for path in paths:
+            if path.name.lower().endswith(".gz"):
+                streamed.append(pool.submit(_aggregate_stream, str(path), block_bytes))
+            else:
+                ranged[path] = [
+                    pool.submit(_aggregate_range, str(path), a, b, block_bytes)
+                    for a, b in split_ranges(path, max_workers, block_bytes)
+                ]
+        for path, futures in ranged.items():
+            try:
+                partials = [f.result() for f in futures]
+            except pa.ArrowInvalid:
+                # A quoted value spans lines, so byte ranges do not split on row boundaries
+                streamed.append(pool.submit(_aggregate_stream, str(path), block_bytes))
+                continue
+            for partial in partials:
+                total.merge(partial)
+        for future in streamed:
+            total.merge(future.result())
+    if len(total.fiscal_years) > 1:
+        years = ", ".join(f"FY{y}" if y else "undated" for y in total.fiscal_years)
+        warnings.warn(
+            f"H-1B disclosure files span {years}; only FY{total.fy} is aggregated "
+            f"({total._petitions_outside_fy():,} petitions from other years are left out)",
+            stacklevel=2,
+        )
+    return total, time.perf_counter() - t0
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Aggregate H-1B disclosure files (dry run; nothing is written).")
+    parser.add_argument("files", nargs="*", help=f"Disclosure CSVs (default: {RAW_H1B_PATTERN} in RAW_DIR)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    paths = [Path(f) for f in args.files] or find_h1b_disclosures()
+    agg, seconds = ingest_h1b_disclosures(paths, max_workers=args.workers)
+    employers = agg.employer_frame()
+    print(
+        f"[{datetime.now().isoformat()}] Aggregated {agg.rows:,} disclosure rows from {len(paths)} file(s) "
+        f"in {seconds:.1f}s ({agg.rows / seconds if seconds else 0:,.0f} rows/s): "
+        f"{int(agg.state_frame()['petitions'].sum()):,} H-1B petitions, {len(employers):,} employers, FY{agg.fy or ' unknown'}"
+    )
+    print(employers.head(10).to_string(index=False))
+    return agg
+
+
+if __name__ == "__main__":
+    main()
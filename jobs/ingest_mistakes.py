@@ -0,0 +1,85 @@
+"""
+Bulk-load job application mistake events into the SQLite event store.
+
+Files are read in chunks (CSV, JSONL or parquet), so memory stays flat however
+large the export is. The whole run is one transaction: an event with an unknown
+source or mistake type aborts it with nothing written.
+
+    python jobs/ingest_mistakes.py exports/mistakes_2025-*.csv
+    python jobs/ingest_mistakes.py --synthetic 100000     # load test with generated events
+"""
+import argparse
+import itertools
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+import sys
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.mistake_store import ingest_events, store_version
+from config.settings import MISTAKES_DB, MISTAKES_INGEST_BATCH, MISTAKE_TYPES, APPLICATION_SOURCES
+
+
+def read_chunks(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield the events in path chunk_rows at a time."""
+    suf = path.suffix.lower()
+    if suf == ".csv":
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    elif suf in (".jsonl", ".json"):
+        yield from pd.read_json(path, lines=True, chunksize=chunk_rows)
+    elif suf == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+
+
+def synthetic_chunks(n: int, chunk_rows: int, seed: int = 0) -> Iterator[pd.DataFrame]:
+    """n generated events over the last year, for load testing."""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now()
+    sources = [s for s in APPLICATION_SOURCES if s != "All"]
+    for start in range(0, n, chunk_rows):
+        k = min(chunk_rows, n - start)
+        yield pd.DataFrame({
+            "date": end - pd.to_timedelta(rng.integers(0, 365 * 86_400, k), unit="s"),
+            "company": rng.choice(["Tech Corp", "Health Inc", "Finance Co", "Startup XYZ", "Big Retail"], k),
+            "job_title": rng.choice(["Software Engineer", "Data Analyst", "Product Manager", "UX Designer"], k),
+            "source": rng.choice(sources, k),
+            "mistake_type": rng.choice(MISTAKE_TYPES, k),
+        })
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Ingest mistake events into the SQLite store.")
+    parser.add_argument("files", nargs="*", help="CSV / JSONL / parquet files of events")
+    parser.add_argument("--synthetic", type=int, default=0, help="Also ingest this many generated events")
+    parser.add_argument("--db", default=str(MISTAKES_DB), help="Store path")
+    parser.add_argument("--batch", type=int, default=MISTAKES_INGEST_BATCH, help="Events per transaction")
+    args = parser.parse_args(argv)
+
+    db = Path(args.db)
+    sources = [read_chunks(Path(f), args.batch) for f in args.files]
+    if args.synthetic:
+        sources.append(synthetic_chunks(args.synthetic, args.batch))
+    t0 = time.perf_counter()
+    rows = ingest_events(itertools.chain.from_iterable(sources), db, args.batch)
+    elapsed = time.perf_counter() - t0
+    print(
+        f"[{datetime.now().isoformat()}] Ingested {rows:,} events in {elapsed:.1f}s "
+        f"({rows / elapsed if elapsed else 0:,.0f} events/s) -> {db} ({store_version(db)})"
+    )
+    return rows
+
+
+if __name__ == "__main__":
+    main()
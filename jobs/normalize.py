@@ -0,0 +1,98 @@
+"""
+Map free-form values from raw exports onto the config.settings vocabularies
+(USA_STATES, JOB_TYPES, COMPANY_TYPES, INDUSTRIES).
+
+normalize_column() factorizes a column and maps only its distinct values, so a
+chunk of a million rows costs one hash pass plus a few hundred Python calls.
+Values that fit no vocabulary entry become "Other" (states: None, so callers can drop them).
+"""
+import re
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.settings import USA_STATES
+
+OTHER = "Other"
+
+STATE_NAMES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "florida": "FL", "georgia": "GA",
+    "hawaii": "HI", "idaho": "ID", "illinois": "IL", "indiana": "IN", "iowa": "IA",
+    "kansas": "KS", "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS", "missouri": "MO",
+    "montana": "MT", "nebraska": "NE", "nevada": "NV", "new hampshire": "NH", "new jersey": "NJ",
+    "new mexico": "NM", "new york": "NY", "north carolina": "NC", "north dakota": "ND", "ohio": "OH",
+    "oklahoma": "OK", "oregon": "OR", "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC",
+    "south dakota": "SD", "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT",
+    "virginia": "VA", "washington": "WA", "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+    "district of columbia": "DC", "washington dc": "DC", "washington d.c.": "DC",
+}
+_STATE_CODES = set(USA_STATES)
+
+# (substring, vocabulary value), checked in order
+_JOB_TYPE_RULES = [
+    ("intern", "Internship"), ("co-op", "Internship"), ("coop", "Internship"),
+    ("part", "Part-time"),
+    ("contract", "Contract"), ("temp", "Contract"), ("freelance", "Contract"), ("consult", "Contract"),
+    ("full", "Full-time"), ("permanent", "Full-time"), ("regular", "Full-time"),
+]
+_COMPANY_TYPE_RULES = [
+    ("startup", "Startup"), ("start-up", "Startup"), ("start up", "Startup"), ("seed", "Startup"),
+    ("non-profit", "Nonprofit"), ("nonprofit", "Nonprofit"), ("not for profit", "Nonprofit"),
+    ("ngo", "Nonprofit"), ("501(c)", "Nonprofit"), ("charit", "Nonprofit"),
+    ("government", "Government"), ("federal", "Government"), ("public sector", "Government"),
+    ("municipal", "Government"),
+    ("enterprise", "Enterprise"), ("corporat", "Enterprise"), ("public company", "Enterprise"),
+    ("private company", "Enterprise"), ("fortune", "Enterprise"), ("large", "Enterprise"),
+]
+_INDUSTRY_RULES = [
+    ("health", "Healthcare"), ("hospital", "Healthcare"), ("pharma", "Healthcare"), ("biotech", "Healthcare"),
+    ("medical", "Healthcare"),
+    ("financ", "Finance"), ("bank", "Finance"), ("insurance", "Finance"), ("invest", "Finance"),
+    ("fintech", "Finance"), ("accounting", "Finance"),
+    ("educat", "Education"), ("universit", "Education"), ("school", "Education"), ("college", "Education"),
+    ("manufactur", "Manufacturing"), ("automotive", "Manufacturing"), ("industrial", "Manufacturing"),
+    ("semiconductor", "Manufacturing"), ("aerospace", "Manufacturing"),
+    ("tech", "Technology"), ("software", "Technology"), ("internet", "Technology"),
+    ("information", "Technology"), ("computer", "Technology"), ("saas", "Technology"), ("it services", "Technology"),
+]
+_SPACES_RE = re.compile(r"\s+")
+
+
+def _clean(value) -> str:
+    return _SPACES_RE.sub(" ", str(value)).strip().lower() if isinstance(value, str) else ""
+
+
+def _by_rules(rules) -> Callable[[object], str]:
+    def normalize(value) -> str:
+        v = _clean(value)
+        for needle, target in rules:
+            if needle in v:
+                return target
+        return OTHER
+    return normalize
+
+
+def normalize_state(value) -> Optional[str]:
+    """Two-letter USA_STATES code for a code or state name ("ca", "California", "CA - Santa Clara"); None if unknown."""
+    v = _clean(value)
+    if not v:
+        return None
+    code = v[:2].upper()
+    if code in _STATE_CODES and (len(v) == 2 or not v[2].isalpha()):
+        return code
+    return STATE_NAMES.get(v.rstrip("."))
+
+
+normalize_job_type = _by_rules(_JOB_TYPE_RULES)
+normalize_company_type = _by_rules(_COMPANY_TYPE_RULES)
+normalize_industry = _by_rules(_INDUSTRY_RULES)
+
+
+def normalize_column(values: pd.Series, normalize: Callable[[object], Optional[str]]) -> pd.Series:
+    """Apply normalize to each distinct value of values; missing values get normalize(None)."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    mapped = np.array([normalize(u) for u in uniques] + [normalize(None)], dtype=object)
+    return pd.Series(mapped[codes], index=values.index)  # code -1 (NA) picks the trailing normalize(None)
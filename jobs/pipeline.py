@@ -0,0 +1,154 @@
+"""
+Small DAG runner for the refresh pipeline.
+
+Steps declare their dependencies and an optional fingerprint of their inputs.
+Independent steps run concurrently in a thread pool (the work is pandas/parquet
+I/O, which releases the GIL for the heavy parts). A step whose fingerprint --
+combined with its upstream fingerprints -- matches the last successful run, and
+whose outputs still exist, is skipped.
+"""
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Step:
+    """One refresh step. fingerprint() describes its inputs; None means always run."""
+    name: str
+    func: Callable[[], Any]
+    deps: Tuple[str, ...] = ()
+    fingerprint: Optional[Callable[[], str]] = None
+    outputs: Tuple[Path, ...] = ()
+
+
+@dataclass
+class StepResult:
+    name: str
+    status: str  # "ran", "skipped", "failed" or "blocked"
+    seconds: float = 0.0
+    fingerprint: Optional[str] = None
+    error: Optional[str] = None
+    value: Any = field(default=None, repr=False)
+
+
+def _load_state(path: Path) -> Dict[str, str]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(path: Path, state: Dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _ordered(steps: List[Step]) -> List[Step]:
+    """Validate names/dependencies and return steps in a topological order."""
+    by_name = {s.name: s for s in steps}
+    if len(by_name) != len(steps):
+        raise ValueError("Duplicate step names in pipeline")
+    order, seen, visiting = [], set(), set()
+
+    def visit(step: Step):
+        if step.name in seen:
+            return
+        if step.name in visiting:
+            raise ValueError(f"Dependency cycle at step {step.name!r}")
+        visiting.add(step.name)
+        for dep in step.deps:
+            if dep not in by_name:
+                raise ValueError(f"Step {step.name!r} depends on unknown step {dep!r}")
+            visit(by_name[dep])
+        visiting.discard(step.name)
+        seen.add(step.name)
+        order.append(step)
+
+    for s in steps:
+        visit(s)
+    return order
+
+
+def run_pipeline(
+    steps: List[Step],
+    state_path: Path,
+    max_workers: int = 4,
+    force: bool = False,
+    previous_state_path: Optional[Path] = None,
+) -> Dict[str, StepResult]:
+    """
+    Run steps respecting dependencies, concurrently where possible.
+    Fingerprints of successful steps are persisted to state_path for the next run;
+    the previous run's fingerprints are read from previous_state_path (default: state_path).
+    """
+    order = _ordered(steps)
+    previous = {} if force else _load_state(previous_state_path or state_path)
+    state = dict(previous)
+    results: Dict[str, StepResult] = {}
+    fingerprints: Dict[str, Optional[str]] = {}
+
+    def effective_fingerprint(step: Step) -> Optional[str]:
+        if step.fingerprint is None or any(fingerprints.get(d) is None for d in step.deps):
+            return None
+        h = hashlib.sha256(step.fingerprint().encode("utf-8"))
+        for d in step.deps:
+            h.update(fingerprints[d].encode("utf-8"))
+        return h.hexdigest()
+
+    def execute(step: Step) -> StepResult:
+        t0 = time.perf_counter()
+        fp = effective_fingerprint(step)
+        if fp is not None and previous.get(step.name) == fp and all(Path(o).exists() for o in step.outputs):
+            return StepResult(step.name, "skipped", time.perf_counter() - t0, fp)
+        try:
+            value = step.func()
+        except Exception as e:
+            return StepResult(step.name, "failed", time.perf_counter() - t0, None, repr(e))
+        return StepResult(step.name, "ran", time.perf_counter() - t0, fp, value=value)
+
+    remaining = list(order)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while remaining or running:
+            for step in list(remaining):
+                dep_results = [results.get(d) for d in step.deps]
+                if any(r is not None and r.status in ("failed", "blocked") for r in dep_results):
+                    results[step.name] = StepResult(step.name, "blocked", error="upstream step failed")
+                    fingerprints[step.name] = None
+                    remaining.remove(step)
+                elif all(r is not None for r in dep_results):
+                    running[pool.submit(execute, step)] = step
+                    remaining.remove(step)
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                step = running.pop(fut)
+                res = fut.result()
+                results[step.name] = res
+                fingerprints[step.name] = res.fingerprint
+                if res.status in ("ran", "skipped") and res.fingerprint is not None:
+                    state[step.name] = res.fingerprint
+                else:
+                    state.pop(step.name, None)
+
+    _save_state(state_path, state)
+    return {s.name: results[s.name] for s in order}
+
+
+def format_report(results: Dict[str, StepResult]) -> str:
+    """Per-step timing table for logs."""
+    lines = []
+    for r in results.values():
+        line = f"  {r.name:<24} {r.status:<8} {r.seconds:8.3f}s"
+        if r.error:
+            line += f"  {r.error}"
+        lines.append(line)
+    return "\n".join(lines)
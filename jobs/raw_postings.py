@@ -0,0 +1,203 @@
+"""
+Streaming ingestion of raw job-posting exports (CSV / JSONL, optionally .gz) from RAW_DIR.
+
+Each file is read RAW_CHUNK_ROWS rows at a time and only the needed columns are
+kept. State, job type, company type and industry are normalized onto the
+config.settings vocabularies (jobs.normalize). Every chunk is then folded into
+two small running aggregates, postings per day and postings per state x segment,
+so memory depends on the chunk size, not on the size of the dump.
+
+Used by the job_postings refresh step when files matching RAW_POSTINGS_PATTERN
+exist; can also be run on its own to check a dump and measure throughput:
+
+    python jobs/raw_postings.py data/raw/postings_2025-06.csv.gz
+"""
+import argparse
+import resource
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+# Add project root to path
+import sys
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import RAW_DIR, RAW_POSTINGS_PATTERN, RAW_CHUNK_ROWS, USA_STATES
+from jobs.normalize import (
+    OTHER,
+    normalize_column,
+    normalize_company_type,
+    normalize_industry,
+    normalize_job_type,
+    normalize_state,
+)
+
+RAW_SUFFIXES = (".csv", ".jsonl", ".json", ".csv.gz", ".jsonl.gz", ".json.gz")
+# Source column names accepted for each field, first match wins (case-insensitive)
+FIELD_ALIASES = {
+    "date": ("date_posted", "posted_date", "posting_date", "date", "created_at"),
+    "state": ("state", "location_state", "job_state", "state_code"),
+    "job_type": ("job_type", "employment_type", "type"),
+    "company_type": ("company_type", "employer_type", "organization_type"),
+    "industry": ("industry", "sector", "company_industry"),
+}
+SEGMENT_KEYS = ["state", "job_type", "company_type", "industry"]
+_NORMALIZERS = {
+    "job_type": normalize_job_type,
+    "company_type": normalize_company_type,
+    "industry": normalize_industry,
+}
+
+
+def find_raw_postings(raw_dir: Path = RAW_DIR, pattern: str = RAW_POSTINGS_PATTERN) -> List[Path]:
+    """Raw posting exports under raw_dir, sorted by name."""
+    if not raw_dir.exists():
+        return []
+    return sorted(p for p in raw_dir.glob(pattern) if p.is_file() and p.name.lower().endswith(RAW_SUFFIXES))
+
+
+def _field_columns(columns: Iterable[str]) -> Dict[str, str]:
+    """Map each field to the source column holding it (fields without a column are left out)."""
+    by_lower = {str(c).strip().lower(): c for c in columns}
+    found = {}
+    for field_name, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            if alias in by_lower:
+                found[field_name] = by_lower[alias]
+                break
+    return found
+
+
+def read_raw_chunks(path: Path, chunk_rows: int = RAW_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield path chunk_rows rows at a time, as frames of the FIELD_ALIASES fields it has."""
+    name = path.name.lower()
+    if ".csv" in name:
+        fields = _field_columns(pd.read_csv(path, nrows=0).columns)
+        if "date" not in fields:
+            raise ValueError(f"{path.name}: no posting date column (expected one of {FIELD_ALIASES['date']})")
+        rename = {src: f for f, src in fields.items()}
+        for chunk in pd.read_csv(path, usecols=list(fields.values()), dtype=str, chunksize=chunk_rows):
+            yield chunk.rename(columns=rename)
+    else:
+        for chunk in pd.read_json(path, lines=True, dtype=False, chunksize=chunk_rows):
+            fields = _field_columns(chunk.columns)
+            if "date" not in fields:
+                raise ValueError(f"{path.name}: no posting date field (expected one of {FIELD_ALIASES['date']})")
+            yield chunk[list(fields.values())].rename(columns={src: f for f, src in fields.items()})
+
+
+@dataclass
+class PostingAggregates:
+    """Running counts over all chunks seen so far, plus ingestion stats."""
+    daily: Optional[pd.Series] = None  # posting day -> postings
+    segments: Optional[pd.Series] = None  # (state, job_type, company_type, industry) -> postings
+    rows: int = 0
+    rows_without_date: int = 0
+    rows_without_state: int = 0
+    unmapped: Dict[str, int] = field(default_factory=dict)  # field -> rows whose value fell back to "Other"
+    missing_field: Dict[str, int] = field(default_factory=dict)  # field -> rows from files without that column
+    files: int = 0
+    seconds: float = 0.0
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        self.rows += len(chunk)
+        days = pd.to_datetime(chunk["date"], errors="coerce", utc=True).dt.tz_localize(None).dt.normalize()
+        self.rows_without_date += int(days.isna().sum())
+        self.daily = _accumulate(self.daily, days.value_counts())
+
+        if "state" in chunk.columns:
+            states = normalize_column(chunk["state"], normalize_state)
+        else:
+            states = pd.Series(None, index=chunk.index, dtype=object)
+        segments = pd.DataFrame({"state": states})
+        for key, normalize in _NORMALIZERS.items():
+            if key in chunk.columns:
+                segments[key] = normalize_column(chunk[key], normalize)
+                # A raw "Other" is a real value, not a fallback
+                fell_back = (segments[key] == OTHER) & (chunk[key].astype(str).str.strip().str.lower() != "other")
+                self.unmapped[key] = self.unmapped.get(key, 0) + int(fell_back.sum())
+            else:
+                segments[key] = OTHER
+                self.missing_field[key] = self.missing_field.get(key, 0) + len(chunk)
+        known = segments["state"].notna()
+        self.rows_without_state += int((~known).sum())
+        self.segments = _accumulate(self.segments, segments[known].value_counts(SEGMENT_KEYS))
+
+    def daily_frame(self) -> pd.DataFrame:
+        """job_postings_daily rows: date, total_postings."""
+        daily = self.daily if self.daily is not None else pd.Series(dtype="int64")
+        return pd.DataFrame({
+            "date": pd.DatetimeIndex(daily.index, name=None),
+            "total_postings": daily.to_numpy(dtype="int64"),
+        }).sort_values("date", ignore_index=True)
+
+    def by_segment_frame(self) -> pd.DataFrame:
+        """job_postings_by_segment rows: state, job_type, company_type, industry, job_count."""
+        if self.segments is None:
+            return pd.DataFrame(columns=SEGMENT_KEYS + ["job_count"])
+        out = self.segments.astype("int64").rename("job_count").reset_index()
+        return out.sort_values(SEGMENT_KEYS, ignore_index=True)
+
+    def by_state_frame(self) -> pd.DataFrame:
+        """job_postings_by_state rows for every state (0 when absent), dated by the newest posting."""
+        segments = self.by_segment_frame()
+        counts = segments.groupby("state")["job_count"].sum().reindex(USA_STATES, fill_value=0)
+        latest = self.daily.index.max() if self.daily is not None and len(self.daily) else pd.Timestamp.now()
+        return pd.DataFrame({
+            "state": USA_STATES,
+            "job_count": counts.to_numpy(dtype="int64"),
+            "date": pd.Timestamp(latest).normalize(),
+        })
+
+    def report(self) -> str:
+        rate = self.rows / self.seconds if self.seconds else 0.0
+        peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+        return (
+            f"{self.rows:,} raw postings from {self.files} file(s) in {self.seconds:.1f}s "
+            f"({rate:,.0f} rows/s; {self.rows_without_date:,} without date, "
+            f"{self.rows_without_state:,} without a US state; peak RSS {peak_mib:,.0f} MiB)"
+            + _field_counts("unmapped values filed under Other", self.unmapped)
+            + _field_counts("no column, filed under Other", self.missing_field)
+        )
+
+
+def _field_counts(label: str, counts: Dict[str, int]) -> str:
+    counts = {k: n for k, n in counts.items() if n}
+    return f"; {label}: " + ", ".join(f"{k} {n:,}" for k, n in counts.items()) if counts else ""
+
+
+def _accumulate(total: Optional[pd.Series], counts: pd.Series) -> pd.Series:
+    return counts if total is None else total.add(counts, fill_value=0)
+
+
+def ingest_raw_postings(paths: Iterable[Path], chunk_rows: int = RAW_CHUNK_ROWS) -> PostingAggregates:
+    """Stream every file through PostingAggregates, one chunk in memory at a time."""
+    agg = PostingAggregates()
+    t0 = time.perf_counter()
+    for path in paths:
+        for chunk in read_raw_chunks(Path(path), chunk_rows):
+            agg.add(chunk)
+        agg.files += 1
+    agg.seconds = time.perf_counter() - t0
+    return agg
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Aggregate raw job-posting exports (dry run; nothing is written).")
+    parser.add_argument("files", nargs="*", help=f"Export files (default: {RAW_POSTINGS_PATTERN} in RAW_DIR)")
+    parser.add_argument("--chunk-rows", type=int, default=RAW_CHUNK_ROWS, help="Rows per chunk")
+    args = parser.parse_args(argv)
+
+    paths = [Path(f) for f in args.files] or find_raw_postings()
+    agg = ingest_raw_postings(paths, args.chunk_rows)
+    print(f"[{datetime.now().isoformat()}] Aggregated {agg.report()}")
+    return agg
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 """
 Run the Dash app. From project root: python run.py
+
+    python run.py          # development server (debug + reloader)
+    python run.py --prod   # production: Gunicorn workers with preloaded data (see gunicorn.conf.py)
 """
+import os
 import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from dashboards.app_dash import app
-
 if __name__ == "__main__":
+    if "--prod" in sys.argv[1:]:
+        os.chdir(PROJECT_ROOT)
+        os.execvp("gunicorn", ["gunicorn", "-c", "gunicorn.conf.py", "wsgi:server"])
+    from dashboards.app_dash import app
     app.run_server(debug=True, host="0.0.0.0", port=8050)
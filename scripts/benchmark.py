@@ -0,0 +1,482 @@
+"""
+Benchmark harness for loaders, analytics services and page callback bodies.
+
+For each scale factor, synthetic datasets are generated by reusing the
+backend.data_loader _synthetic_* generators, scaled up, and written to a
+throwaway snapshot directory in the same layout the refresh publishes:
+flat parquet files plus year=/month= partitions. Every benchmark then reports
+latency percentiles over repeated runs and the peak traced memory of one
+extra run. Results are written as JSON. Pass --baseline to compare them
+against an earlier results file.
+
+    python scripts/benchmark.py                          # scales 10, 100, 1000
+    python scripts/benchmark.py --scales 10 --only mistakes
+    python scripts/benchmark.py --output new.json --baseline data/benchmarks/baseline.json
+
+Only datasets with a natural row dimension grow with the scale: the mistakes
+log, postings by segment, the daily postings history (capped at ~10 years) and
+the resume length. Per-state tables always have one row per state.
+"""
+import argparse
+import base64
+import io
+import json
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    DATA_DIR,
+    H1B_STATE_AGGREGATE,
+    JOB_POSTINGS_BY_STATE,
+    JOB_POSTINGS_BY_SEGMENT,
+    JOB_POSTINGS_DAILY,
+    STATE_METRICS_CUBE,
+    MISTAKES_AGGREGATE,
+    MISTAKES_DAILY_ROLLUP,
+)
+from backend import data_loader, snapshots
+from backend.data_loader import (
+    _synthetic_h1b_by_state,
+    _synthetic_job_postings_by_state,
+    _synthetic_job_postings_by_segment,
+    _synthetic_job_postings_daily,
+    _synthetic_mistakes,
+    _build_state_metrics_cube,
+    _build_mistakes_daily_rollup,
+    categorize,
+    MISTAKES_CATEGORICAL,
+    SEGMENT_CATEGORICAL,
+)
+from backend.frame_cache import FRAME_CACHE
+from backend.services import h1b_analytics, mistake_analytics, resume_analyzer
+from backend.services import resume_cache
+from backend.services.resume_cache import _ANALYSIS_CACHE, cache_path
+from dashboards import figure_cache
+from dashboards.pages import candidate_analysis, h1b_market, job_mistakes, main_map
+from jobs.daily_refresh import _upsert_partitions, _write_parquet
+
+DEFAULT_OUTPUT = DATA_DIR / "benchmarks" / "latest.json"
+
+SAMPLE_JOB_DESCRIPTION = (
+    "We are hiring a data engineer with Python, SQL, Spark and AWS experience. "
+    "Visa sponsorship available for candidates on OPT or STEM OPT. Experience with "
+    "machine learning pipelines, Docker and Kubernetes is a plus."
+)
+_RESUME_HEADER = [
+    "Jane Doe - Data Engineer",
+    "Professional Summary: Data engineer building analytics pipelines.",
+    "Work Authorization: F1 OPT, STEM OPT eligible (no sponsorship needed until 2027).",
+    "Skills: Python, SQL, Spark, AWS, Docker, Tableau, machine learning",
+    "Education: M.S. Computer Science",
+]
+_RESUME_BULLET = (
+    "- Built {n} ETL jobs in Python and SQL on AWS, cutting report latency by {p}% "
+    "for a team of analysts using Tableau and Excel."
+)
+
+
+# Scaled datasets
+
+def _rng(scale: int) -> np.random.Generator:
+    return np.random.default_rng(1000 + scale)
+
+
+def _scaled_mistakes(scale: int) -> pd.DataFrame:
+    """scale copies of the synthetic log spread over up to 3 years, with shuffled attributes."""
+    base = _synthetic_mistakes()
+    rng = _rng(scale)
+    copies = []
+    for i in range(scale):
+        part = base.copy()
+        part["date"] = part["date"] - pd.Timedelta(days=90 * (i % 12))
+        copies.append(part)
+    df = pd.concat(copies, ignore_index=True)
+    for col in ("company", "job_title", "source", "mistake_type"):
+        df[col] = rng.permutation(df[col].to_numpy())
+    df["id"] = np.arange(len(df))
+    return df
+
+
+def _scaled_job_postings_daily(scale: int) -> pd.DataFrame:
+    """The 90-day synthetic series repeated back in time (at most 40 x 90 days)."""
+    base = _synthetic_job_postings_daily()
+    copies = []
+    for i in range(min(scale, 40)):
+        part = base.copy()
+        part["date"] = part["date"] - pd.Timedelta(days=90 * i)
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True).sort_values("date", ignore_index=True)
+
+
+def _scaled_job_postings_by_segment(scale: int) -> pd.DataFrame:
+    """scale rows per state x segment (e.g. one per source feed) instead of one."""
+    base = _synthetic_job_postings_by_segment()
+    rng = _rng(scale)
+    df = pd.concat([base] * scale, ignore_index=True)
+    df["job_count"] = rng.binomial(df["job_count"].to_numpy(), 1 / scale) if scale > 1 else df["job_count"]
+    return df
+
+
+def write_snapshot(scale: int) -> Dict[str, int]:
+    """Write and publish a snapshot of scaled datasets; returns row counts per dataset."""
+    out_dir = snapshots.new_snapshot_dir()
+    h1b = _synthetic_h1b_by_state()
+    by_state = _synthetic_job_postings_by_state()
+    by_segment = categorize(_scaled_job_postings_by_segment(scale), SEGMENT_CATEGORICAL)
+    cube = _build_state_metrics_cube(h1b, by_segment)
+    daily = _scaled_job_postings_daily(scale)
+    mistakes = categorize(_scaled_mistakes(scale), MISTAKES_CATEGORICAL)
+    rollup = _build_mistakes_daily_rollup(mistakes)
+
+    _write_parquet(h1b, out_dir / H1B_STATE_AGGREGATE.name)
+    _write_parquet(by_state, out_dir / JOB_POSTINGS_BY_STATE.name)
+    _write_parquet(by_segment, out_dir / JOB_POSTINGS_BY_SEGMENT.name)
+    _write_parquet(cube, out_dir / STATE_METRICS_CUBE.name, index=True)
+    _upsert_partitions(daily, out_dir / JOB_POSTINGS_DAILY.name, "bench")
+    _upsert_partitions(mistakes, out_dir / MISTAKES_AGGREGATE.name, "bench")
+    _write_parquet(rollup, out_dir / MISTAKES_DAILY_ROLLUP.name)
+    snapshots.publish(out_dir)
+    return {
+        "job_postings_by_segment": len(by_segment),
+        "state_metrics_cube": len(cube),
+        "job_postings_daily": len(daily),
+        "mistakes": len(mistakes),
+        "mistakes_daily_rollup": len(rollup),
+    }
+
+
+def resume_lines(scale: int) -> List[str]:
+    bullets = [_RESUME_BULLET.format(n=i + 3, p=10 + i % 80) for i in range(5 * scale)]
+    return _RESUME_HEADER + bullets
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def resume_pdf(lines: List[str], lines_per_page: int = 50) -> bytes:
+    """Minimal multi-page PDF (Helvetica text) so PDF extraction can be benchmarked without extra deps."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    page_ids = [4 + 2 * k for k in range(len(pages))]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in page_ids)}] /Count {len(pages)} >>".encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, page in zip(page_ids, pages):
+        ops = ["BT", "/F1 9 Tf", "12 TL", "40 800 Td"] + [f"({_pdf_escape(l)}) Tj T*" for l in page] + ["ET"]
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        ).encode()
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = out.tell()
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id]))
+    xref = out.tell()
+    size = max(objects) + 1
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+    for obj_id in range(1, size):
+        out.write(b"%010d 00000 n \n" % offsets[obj_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref))
+    return out.getvalue()
+
+
+def resume_docx(lines: List[str]) -> bytes:
+    Document = resume_analyzer._docx_document()
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+# Benchmarks
+
+@dataclass
+class Benchmark:
+    """One timed call. setup() runs before every call (untimed), e.g. to drop caches."""
+    name: str
+    group: str
+    func: Callable[[], object]
+    setup: Optional[Callable[[], None]] = None
+
+
+class _CallbackRecorder:
+    """Stand-in for the Dash app: register_callbacks(recorder) captures the callback bodies by name."""
+
+    def __init__(self):
+        self.functions: Dict[str, Callable] = {}
+
+    def callback(self, *args, **kwargs):
+        def decorator(fn):
+            self.functions[fn.__name__] = fn
+            return fn
+        return decorator
+
+    def clientside_callback(self, *args, **kwargs):
+        pass  # runs in the browser; nothing to time here
+
+
+def page_callbacks() -> Dict[str, Callable]:
+    recorder = _CallbackRecorder()
+    for page in (main_map, job_mistakes, h1b_market, candidate_analysis):
+        page.register_callbacks(recorder)
+    return recorder.functions
+
+
+def _cold_frames():
+    FRAME_CACHE.invalidate()
+
+
+def _cold_figures():
+    figure_cache.clear_figure_cache(disk=True)
+
+
+def build_benchmarks(scale: int, callbacks: Dict[str, Callable]) -> Tuple[List[Benchmark], Callable[[], None]]:
+    """Benchmarks for one scale, plus a cleanup that drops the resume caches they populate."""
+    today = pd.Timestamp.now().normalize()
+    last_90 = (today - pd.Timedelta(days=90), today)
+    lines = resume_lines(scale)
+    text = "\n".join(lines)
+    pdf = resume_pdf(lines)
+    docx = resume_docx(lines)
+    pdf_upload = "data:application/pdf;base64," + base64.b64encode(pdf).decode("ascii")
+
+    def cold_resume():
+        _ANALYSIS_CACHE.clear()
+        cache_path(pdf, ".pdf").unlink(missing_ok=True)
+
+    update_mistakes = callbacks["update_mistakes"]
+    update_h1b_market = callbacks["update_h1b_market"]
+    run_analysis = callbacks["run_analysis"]
+    start_iso, end_iso = (d.date().isoformat() for d in last_90)
+
+    return [
+        # Loaders: cold reads from the snapshot
+        Benchmark("load_state_metrics_cube", "loader", data_loader.load_state_metrics_cube, _cold_frames),
+        Benchmark("load_job_postings_daily", "loader", data_loader.load_job_postings_daily, _cold_frames),
+        Benchmark("load_mistakes", "loader", data_loader.load_mistakes, _cold_frames),
+        Benchmark("load_mistakes[last_90d]", "loader", lambda: data_loader.load_mistakes(*last_90), _cold_frames),
+        Benchmark("load_mistakes_daily_rollup", "loader", data_loader.load_mistakes_daily_rollup, _cold_frames),
+        # Services: warm loader cache (steady state of a worker)
+        Benchmark("get_state_level_metrics", "service",
+                  lambda: h1b_analytics.get_state_level_metrics("Full-time", "Enterprise", "Technology")),
+        Benchmark("get_daily_job_trends", "service", h1b_analytics.get_daily_job_trends),
+        Benchmark("get_state_detail", "service", lambda: h1b_analytics.get_state_detail("CA")),
+        Benchmark("get_top_states_by_jobs", "service", lambda: h1b_analytics.get_top_states_by_jobs(15)),
+        Benchmark("get_top_states_by_h1b", "service", lambda: h1b_analytics.get_top_states_by_h1b(15)),
+        Benchmark("get_mistakes_filtered", "service",
+                  lambda: mistake_analytics.get_mistakes_filtered(*last_90, source="LinkedIn")),
+        Benchmark("get_mistakes_by_type_df", "service", lambda: mistake_analytics.get_mistakes_by_type_df(*last_90)),
+        Benchmark("get_mistakes_by_source_df", "service",
+                  lambda: mistake_analytics.get_mistakes_by_source_df(*last_90)),
+        Benchmark("get_mistakes_time_series", "service",
+                  lambda: mistake_analytics.get_mistakes_time_series(*last_90)),
+        Benchmark("get_mistakes_summary", "service", lambda: mistake_analytics.get_mistakes_summary(*last_90)),
+        Benchmark("analyze_resume", "service", lambda: resume_analyzer.analyze_resume(text, SAMPLE_JOB_DESCRIPTION)),
+        Benchmark("extract_resume_text[pdf]", "service",
+                  lambda: resume_analyzer.extract_resume_text_from_bytes(pdf, ".pdf")),
+        Benchmark("extract_resume_text[docx]", "service",
+                  lambda: resume_analyzer.extract_resume_text_from_bytes(docx, ".docx")),
+        # Callback bodies: cold renders, plus the memoized repeat-view path
+        # The map page ships every filter combination once; filter changes are applied clientside
+        Benchmark("main_map_layout", "callback", main_map.layout, _cold_figures),
+        Benchmark("main_map_layout[cached]", "callback", main_map.layout),
+        Benchmark("update_mistakes", "callback", lambda: update_mistakes(start_iso, end_iso, "LinkedIn", "All")),
+        Benchmark("update_h1b_market", "callback", lambda: update_h1b_market(None), _cold_figures),
+        Benchmark("run_analysis", "callback", lambda: run_analysis(1, pdf_upload, SAMPLE_JOB_DESCRIPTION),
+                  cold_resume),
+        Benchmark("run_analysis[cached]", "callback", lambda: run_analysis(1, pdf_upload, SAMPLE_JOB_DESCRIPTION)),
+    ], cold_resume
+
+
+def check_state_level_metrics() -> None:
+    """A filter combination with a single state row must still come back as a one-row frame, not a Series."""
+    cube = pd.DataFrame({
+        "job_type": ["All", "Contract"], "company_type": ["All"] * 2, "industry": ["All"] * 2,
+        "state": ["CA", "TX"], "job_count": [10, 1], "petitions": [5, 0], "effectiveness_score": [0.5, 0.0],
+    }).set_index(["job_type", "company_type", "industry"])
+    loader = h1b_analytics.load_state_metrics_cube
+    h1b_analytics.load_state_metrics_cube = lambda: cube
+    try:
+        single = h1b_analytics.get_state_level_metrics("Contract")
+    finally:
+        h1b_analytics.load_state_metrics_cube = loader
+    if not isinstance(single, pd.DataFrame) or single["state"].tolist() != ["TX"]:
+        raise AssertionError(f"get_state_level_metrics returned {type(single).__name__} for a single-state combination")
+
+
+def measure(bench: Benchmark, repeat: int, min_repeat: int, max_seconds: float) -> dict:
+    """Time bench.func (one untimed warm-up), then trace one extra run for peak memory."""
+    if bench.setup:
+        bench.setup()
+    bench.func()
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < repeat:
+        if bench.setup:
+            bench.setup()
+        t0 = time.perf_counter()
+        bench.func()
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= min_repeat and time.perf_counter() - started > max_seconds:
+            break
+
+    if bench.setup:
+        bench.setup()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        bench.func()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    ms = np.array(samples) * 1000
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {
+        "iterations": len(samples),
+        "p50_ms": round(float(p50), 4),
+        "p90_ms": round(float(p90), 4),
+        "p99_ms": round(float(p99), 4),
+        "mean_ms": round(float(ms.mean()), 4),
+        "min_ms": round(float(ms.min()), 4),
+        "max_ms": round(float(ms.max()), 4),
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmarks(scales: List[int], repeat: int, min_repeat: int, max_seconds: float,
+                   only: Optional[str] = None) -> dict:
+    """Run every benchmark at every scale against throwaway snapshots; returns the results document."""
+    pattern = re.compile(only) if only else None
+    check_state_level_metrics()
+    callbacks = page_callbacks()
+    meta = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "scales": scales,
+        "repeat": repeat,
+        "datasets": {},
+    }
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        tmp = Path(tmp)
+        # Point snapshot resolution and the figure and resume text disk caches at the throwaway directory
+        saved = (snapshots.PROCESSED_DIR, snapshots.SNAPSHOTS_DIR, snapshots.CURRENT_SNAPSHOT_MANIFEST,
+                 figure_cache.FIGURE_CACHE_DIR, resume_cache.RESUME_TEXT_CACHE_DIR)
+        snapshots.PROCESSED_DIR = tmp
+        snapshots.SNAPSHOTS_DIR = tmp / "snapshots"
+        snapshots.CURRENT_SNAPSHOT_MANIFEST = tmp / "CURRENT.json"
+        figure_cache.FIGURE_CACHE_DIR = tmp / "figure_cache"
+        resume_cache.RESUME_TEXT_CACHE_DIR = tmp / "text_cache"
+        cleanup = None
+        try:
+            for scale in scales:
+                print(f"scale {scale}x: writing datasets ...", file=sys.stderr)
+                meta["datasets"][str(scale)] = write_snapshot(scale)
+                FRAME_CACHE.invalidate()
+                figure_cache.clear_figure_cache(disk=True)
+                benchmarks, cleanup = build_benchmarks(scale, callbacks)
+                for bench in benchmarks:
+                    if pattern and not pattern.search(bench.name):
+                        continue
+                    stats = measure(bench, repeat, min_repeat, max_seconds)
+                    results.append({"name": bench.name, "group": bench.group, "scale": scale, **stats})
+                    print(f"  {bench.name:<32} p50 {stats['p50_ms']:10.3f} ms  "
+                          f"p99 {stats['p99_ms']:10.3f} ms  peak {stats['peak_mem_kb']:10.1f} KiB",
+                          file=sys.stderr)
+        finally:
+            if cleanup:
+                cleanup()
+            (snapshots.PROCESSED_DIR, snapshots.SNAPSHOTS_DIR, snapshots.CURRENT_SNAPSHOT_MANIFEST,
+             figure_cache.FIGURE_CACHE_DIR, resume_cache.RESUME_TEXT_CACHE_DIR) = saved
+            FRAME_CACHE.invalidate()
+            figure_cache.clear_figure_cache()
+    return {"meta": meta, "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float, noise_ms: float = 0.05) -> List[str]:
+    """Print p50 changes against a baseline; return the benchmarks that regressed beyond threshold."""
+    base = {(r["name"], r["scale"]): r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"{'benchmark':<34} {'scale':>6} {'base p50':>12} {'p50':>12} {'change':>8}")
+    for r in current["results"]:
+        b = base.get((r["name"], r["scale"]))
+        if b is None:
+            print(f"{r['name']:<34} {r['scale']:>6} {'-':>12} {r['p50_ms']:>12.3f} {'new':>8}")
+            continue
+        ratio = r["p50_ms"] / b["p50_ms"] if b["p50_ms"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold and r["p50_ms"] - b["p50_ms"] > noise_ms:
+            flag = "  REGRESSION"
+            regressions.append(f"{r['name']}@{r['scale']}x")
+        print(f"{r['name']:<34} {r['scale']:>6} {b['p50_ms']:>12.3f} {r['p50_ms']:>12.3f} "
+              f"{(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark loaders, services and page callbacks.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Dataset scale factors (x the default synthetic size)")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed runs per benchmark")
+    parser.add_argument("--min-repeat", type=int, default=3, help="Timed runs even when over --max-seconds")
+    parser.add_argument("--max-seconds", type=float, default=5.0, help="Time budget per benchmark")
+    parser.add_argument("--only", help="Regex; only run benchmarks whose name matches")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Results JSON path")
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative p50 slowdown reported as a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    doc = run_benchmarks(args.scales, args.repeat, args.min_repeat, args.max_seconds, args.only)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(f"Wrote {len(doc['results'])} results to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        regressions = compare(doc, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
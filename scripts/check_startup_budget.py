@@ -0,0 +1,82 @@
+"""
+Startup budget check: measures `python -X importtime` for the app and refresh
+entry points and fails (exit 1) when a budget is exceeded or a heavy module is
+imported eagerly. Run from project root (e.g. in CI):
+
+    python scripts/check_startup_budget.py
+    python scripts/check_startup_budget.py --scale 2   # slower machines
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# module -> (budget in ms of cumulative import time, modules that must not be imported eagerly)
+BUDGETS = {
+    "config.settings": (50, ("pandas", "numpy", "dash")),
+    "dashboards.app_dash": (2500, ("pandas", "plotly.express", "pdfplumber", "docx")),
+    "jobs.daily_refresh": (1500, ("dash", "plotly", "pdfplumber", "docx")),
+}
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times(module: str) -> dict:
+    """Run a fresh interpreter importing module; return {name: (cumulative_us, depth)}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            times[m.group(4)] = (int(m.group(2)), (len(m.group(3)) - 1) // 2)
+    return times
+
+
+def check(module: str, budget_ms: float, forbidden, top: int = 8) -> list:
+    """Return a list of failure messages (empty when within budget) and print a report."""
+    times = import_times(module)
+    total_ms = times.get(module, (0, 0))[0] / 1000
+    failures = []
+    if total_ms > budget_ms:
+        failures.append(f"{module}: {total_ms:.0f} ms exceeds budget of {budget_ms:.0f} ms")
+    for name in forbidden:
+        if name in times:
+            failures.append(f"{module}: imports {name} eagerly ({times[name][0] / 1000:.0f} ms)")
+    print(f"{module}: {total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    direct = sorted(((us, n) for n, (us, depth) in times.items() if depth == 1), reverse=True)
+    for us, name in direct[:top]:
+        print(f"    {us / 1000:8.1f} ms  {name}")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check import-time startup budgets.")
+    parser.add_argument("--scale", type=float, default=float(os.environ.get("STARTUP_BUDGET_SCALE", 1.0)),
+                        help="Multiply every budget (for slower machines)")
+    parser.add_argument("modules", nargs="*", help="Only check these entry points")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module, (budget_ms, forbidden) in BUDGETS.items():
+        if args.modules and module not in args.modules:
+            continue
+        failures += check(module, budget_ms * args.scale, forbidden)
+    for f in failures:
+        print(f"FAIL {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
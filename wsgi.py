@@ -0,0 +1,18 @@
+"""
+Production WSGI entry point: gunicorn -c gunicorn.conf.py wsgi:server
+
+Datasets are preloaded at import. With preload_app (see gunicorn.conf.py) this
+happens once in the master, and forked workers share the frames copy-on-write.
+"""
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import ensure_data_dirs
+from backend.data_loader import preload_datasets
+from dashboards.app_dash import app, server
+
+ensure_data_dirs()
+preload_datasets()